@@ -0,0 +1,273 @@
+import os, re, json, argparse, tempfile, threading, time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from main import init_browser, validate_yaml
+from linkedineasyapply import LinkedinEasyApply, FixtureRecorder, IMPLICIT_WAIT_SECONDS
+
+# Injected into every replayed search page. LinkedIn's own scripts are not recorded, so this stands in for
+# them: clicking a job loads its recorded details pane, and the Easy Apply button and the modal's buttons
+# step through the recorded modal steps, ending with a confirmation dialog.
+REPLAY_SHIM = """
+<script>
+(() => {
+    const load = path => {
+        const request = new XMLHttpRequest();
+        request.open('GET', '/__replay__/' + path, false);
+        request.send();
+        return request.status === 200 ? request.responseText : null;
+    };
+    const detailsSelector = '.scaffold-layout__detail, .jobs-search__job-details--container, .jobs-details';
+    let jobId = null;
+    let step = 0;
+    const closeModal = () => document.querySelectorAll('.artdeco-modal-overlay, .jobs-easy-apply-modal, .replay-dialog')
+        .forEach(node => node.remove());
+    const showModal = html => {
+        closeModal();
+        (document.getElementById('artdeco-modal-outlet') || document.body).insertAdjacentHTML('afterbegin', html);
+    };
+    const dialog = (buttonClass, text) =>
+        `<div class="replay-dialog artdeco-modal" role="dialog"><p>${text}</p><button class="${buttonClass}">${text}</button></div>`;
+
+    document.addEventListener('click', event => {
+        const target = event.target;
+        const inModal = !!target.closest('.jobs-easy-apply-modal');
+        const tile = target.closest('[data-occludable-job-id], .scaffold-layout__list-item');
+        if (tile && !inModal) {
+            event.preventDefault();
+            const card = tile.querySelector('[data-job-id]');
+            jobId = tile.getAttribute('data-occludable-job-id') || (card && card.getAttribute('data-job-id'));
+            const html = load('jobs/' + jobId + '.html');
+            const container = document.querySelector(detailsSelector);
+            if (html !== null && container) container.innerHTML = html;
+            const url = new URL(window.location.href);
+            url.searchParams.set('currentJobId', jobId);
+            history.replaceState(null, '', url);
+        } else if (target.closest('.jobs-apply-button')) {
+            event.preventDefault();
+            step = 0;
+            const html = load('modal/' + jobId + '/0.html');
+            if (html !== null) showModal(html);
+        } else if (inModal && target.closest('.artdeco-button--primary')) {
+            event.preventDefault();
+            step += 1;
+            const html = load('modal/' + jobId + '/' + step + '.html');
+            showModal(html !== null ? html : dialog('artdeco-modal__dismiss', 'Application sent'));
+        } else if (inModal && target.closest('.artdeco-modal__dismiss')) {
+            event.preventDefault();
+            document.body.insertAdjacentHTML('beforeend', dialog('artdeco-modal__confirm-dialog-btn', 'Discard'));
+        } else if (target.closest('.artdeco-modal__dismiss, .artdeco-modal__confirm-dialog-btn')) {
+            event.preventDefault();
+            closeModal();
+        } else if (target.closest('a[href]')) {
+            event.preventDefault();
+        }
+    }, true);
+})();
+</script>
+"""
+
+NO_RESULTS_PAGE = """<!DOCTYPE html>
+<html><body><div class="jobs-search-two-pane__no-results-banner--expand">No matching jobs found.</div></body></html>
+"""
+
+# Instant answers from the stand-in for the AI, by the kind of question its system prompt asks
+STAND_IN_ANSWERS = {'job fit': 'APPLY', 'numeric': '1', 'choice': '0', 'text': 'Replayed answer'}
+
+
+def stand_in_answer(system_prompt):
+    if 'evaluating job fit' in system_prompt:
+        return STAND_IN_ANSWERS['job fit']
+    if 'numeric answers' in system_prompt:
+        return STAND_IN_ANSWERS['numeric']
+    if 'answer choice' in system_prompt:
+        return STAND_IN_ANSWERS['choice']
+    return STAND_IN_ANSWERS['text']
+
+
+def stand_in_completion(request):
+    """
+    Answer a chat completion request at once with a fixed answer, in the shape of OpenAI's response, so the replay
+    exercises the AI code paths without real API calls, their cost or their network latency.
+    """
+    messages = request.get('messages') or [{'content': ''}]
+    if (request.get('response_format') or {}).get('type') == 'json_object':
+        questions = re.findall(r'Question id "([^"]+)" \((\w+)\)', messages[-1]['content'])
+        content = json.dumps({question_id: STAND_IN_ANSWERS.get(kind, STAND_IN_ANSWERS['text']) for question_id, kind in questions})
+    else:
+        content = stand_in_answer(messages[0]['content'])
+    return {
+        'id': 'replay', 'object': 'chat.completion', 'created': int(time.time()), 'model': request.get('model', 'replay'),
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+        'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+    }
+
+
+# Metrics where a higher value is better; every other compared metric is better when lower
+HIGHER_IS_BETTER = ('applications_per_hour',)
+
+
+def fixture_handler(fixture_directory):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.startswith('/__replay__/'):
+                self.send_fixture(url.path[len('/__replay__/'):])
+            elif url.path.startswith('/jobs/search'):
+                query = parse_qs(url.query)
+                page = int(query.get('start', ['0'])[0]) // 25
+                relative_path = FixtureRecorder.search_page_path(query.get('keywords', [''])[0], query.get('location', [''])[0], page)
+                path = os.path.join(fixture_directory, relative_path)
+                if os.path.isfile(path):
+                    with open(path, encoding='utf-8') as f:
+                        html = f.read()
+                    html = html.replace('</body>', REPLAY_SHIM + '</body>', 1) if '</body>' in html else html + REPLAY_SHIM
+                else:
+                    html = NO_RESULTS_PAGE
+                self.send_html(html)
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/v1/chat/completions':
+                self.send_error(404)
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            self.send_body(json.dumps(stand_in_completion(request)).encode('utf-8'), 'application/json')
+
+        def send_fixture(self, relative_path):
+            path = os.path.normpath(os.path.join(fixture_directory, relative_path))
+            if not path.startswith(os.path.abspath(fixture_directory)) or not os.path.isfile(path):
+                self.send_error(404)
+                return
+            with open(path, encoding='utf-8') as f:
+                self.send_html(f.read())
+
+        def send_html(self, html):
+            self.send_body(html.encode('utf-8'), 'text/html; charset=utf-8')
+
+        def send_body(self, body, content_type):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def start_fixture_server(fixture_directory):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), fixture_handler(os.path.abspath(fixture_directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_replay(config_path, fixture_directory, headed=False):
+    """Drive LinkedinEasyApply through the recorded fixtures and return its timings and counts."""
+    with open(os.path.join(fixture_directory, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    parameters = validate_yaml(config_path)
+    work_directory = tempfile.mkdtemp(prefix='replay_')
+    server = start_fixture_server(fixture_directory)
+    server_url = f"http://127.0.0.1:{server.server_address[1]}"
+    parameters.update({
+        'linkedinBaseUrl': server_url,
+        # AI requests go to the fixture server's stand-in, never to a real, billed API
+        'openaiApiKey': 'replay',
+        'llmBaseUrl': f"{server_url}/v1",
+        'llmMaxRetries': 0,
+        'positions': sorted({search['position'] for search in manifest['searches']}),
+        'locations': sorted({search['location'] for search in manifest['searches']}),
+        # Every replay starts from an empty ledger and cache, and skips deliberate pacing
+        'ledgerFile': os.path.join(work_directory, 'applications.db'),
+        'aiCacheFile': os.path.join(work_directory, 'ai_cache.db'),
+        'outputFileDirectory': work_directory,
+        'metricsFile': None,
+        'recordFixtures': None,
+        'disableAntiLock': True,
+        'dryRun': True,
+        # Local pages are ready almost at once, so a missing element should not cost the full timeout
+        'readinessTimeout': min(parameters.get('readinessTimeout', 10), 2)
+    })
+
+    browser = init_browser(os.path.join(work_directory, 'chrome_profile'), 9400, lean=not headed)
+    bot = LinkedinEasyApply(parameters, browser)
+    start = time.perf_counter()
+    try:
+        bot.start_applying()
+    finally:
+        elapsed = time.perf_counter() - start
+        bot.close()
+        browser.quit()
+        server.shutdown()
+
+    applications = bot.run_counts['applied']
+    results = {
+        'elapsed_seconds': round(elapsed, 2),
+        'applications': applications,
+        'applications_per_hour': round(applications * 3600 / elapsed, 1) if elapsed else 0,
+        'webdriver_calls': bot.metrics.counters['webdriver_calls'],
+        'webdriver_calls_per_application': round(bot.metrics.counters['webdriver_calls'] / applications, 1) if applications else None,
+        'implicit_wait_miss_seconds': round(bot.metrics.counters['implicit_wait_miss_seconds'], 2),
+        'implicit_wait_seconds_avoided': bot.metrics.counters['zero_wait_misses'] * IMPLICIT_WAIT_SECONDS,
+        'stages': {name: {'count': stat['count'], 'mean_seconds': round(stat['seconds'] / stat['count'], 4)}
+                   for name, stat in bot.metrics.stages.items()}
+    }
+    return results
+
+
+def flatten(results):
+    values = {name: value for name, value in results.items() if name != 'stages' and isinstance(value, (int, float))}
+    for name, stat in results.get('stages', {}).items():
+        values[f"stage {name}"] = stat['mean_seconds']
+    return values
+
+
+def compare(results, baseline, tolerance):
+    """Print current results next to the baseline and return the names of metrics that regressed beyond tolerance."""
+    current, previous = flatten(results), flatten(baseline)
+    regressions = []
+    print(f"{'metric':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name in sorted(set(current) | set(previous)):
+        new, old = current.get(name), previous.get(name)
+        if new is None or old is None:
+            print(f"{name:<40} {str(old):>12} {str(new):>12}")
+            continue
+        change = (new - old) / old if old else 0.0
+        worse = -change if name in HIGHER_IS_BETTER else change
+        # The raw totals depend on how many fixtures were recorded and are shown for context only
+        compared = name not in ('elapsed_seconds', 'applications', 'webdriver_calls', 'implicit_wait_seconds_avoided')
+        flag = "  REGRESSION" if compared and worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<40} {old:>12} {new:>12} {change:>+8.1%}{flag}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay recorded LinkedIn pages to benchmark the bot offline")
+    parser.add_argument('--fixtures', default='fixtures',
+                        help="Directory of fixtures recorded with recordFixtures in config.yaml (default fixtures).")
+    parser.add_argument('--config', default='config.yaml', help="Config file with the answers to use (default config.yaml).")
+    parser.add_argument('--baseline', default='benchmark_baseline.json', help="Baseline results to compare against.")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run's results as the new baseline.")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Relative change beyond which a metric counts as a regression (default 0.2).")
+    parser.add_argument('--headed', action='store_true', help="Show the browser instead of running headless.")
+    args = parser.parse_args()
+
+    results = run_replay(args.config, args.fixtures, args.headed)
+    print(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved the baseline to {args.baseline}")
+    elif os.path.isfile(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")
+            raise SystemExit(1)
@@ -1,4 +1,6 @@
-import time, random, csv, pyautogui, traceback, os, re
+import time, random, pyautogui, traceback, os, re, sqlite3, json, hashlib, threading, socket, math
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
@@ -7,60 +9,676 @@ from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from itertools import product
+from collections import Counter
 from pypdf import PdfReader
-from openai import OpenAI
+import httpx
+from openai import OpenAI, APIConnectionError, APITimeoutError, RateLimitError, InternalServerError
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # Optional, only used to report Chrome's memory use
+
+class AnswerCache:
+    """
+    On-disk LRU cache of AI answers to application questions.
+
+    Answers are keyed by the normalized question text, the response type and the offered options, and
+    every entry is tagged with a fingerprint of the resume and profile it was generated from. Entries
+    with a different fingerprint are dropped when the cache is opened, so editing the resume or the
+    profile in config.yaml invalidates them automatically.
+    """
+    def __init__(self, path, fingerprint, max_entries=5000):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path, timeout=30)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS answers (
+                    key TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    question TEXT NOT NULL,
+                    response_type TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._connection.execute("CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)")
+            invalidated = self._connection.execute("DELETE FROM answers WHERE fingerprint != ?", (fingerprint,)).rowcount
+        if invalidated:
+            print(f"Resume or profile changed, dropped {invalidated} cached AI answers")
+
+    @staticmethod
+    def normalize(question_text):
+        question_text = re.sub(r'\s+', ' ', question_text.lower())
+        return question_text.strip(' *?:.')
+
+    def _key(self, question_text, response_type, options):
+        option_texts = [self.normalize(text) for _, text in options] if options else []
+        raw = json.dumps([self.normalize(question_text), response_type, option_texts])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, question_text, response_type, options=None):
+        """Return the cached answer, or None on a miss."""
+        key = self._key(question_text, response_type, options)
+        row = self._connection.execute("SELECT answer FROM answers WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with self._connection:
+            self._connection.execute("UPDATE answers SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, question_text, response_type, options, answer):
+        key = self._key(question_text, response_type, options)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO answers (key, fingerprint, question, response_type, answer, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, self.fingerprint, self.normalize(question_text), response_type, json.dumps(answer), time.time()))
+            # Evict the least recently used answers once the cache grows past its limit
+            self._connection.execute("""
+                DELETE FROM answers WHERE key IN (
+                    SELECT key FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = (100.0 * self.hits / lookups) if lookups else 0.0
+        return f"AI answer cache: {self.hits} hits, {self.misses} misses ({hit_rate:.0f}% hit rate)"
+
+class JobFitCache:
+    """
+    On-disk cache of job fit decisions, keyed by job ID and by a hash of the job description.
+
+    Decisions are tagged with the same resume and profile fingerprint as the answer cache and expire
+    after the configured time to live.
+    """
+    def __init__(self, path, fingerprint, ttl_days=30):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.ttl = ttl_days * 24 * 60 * 60
+        self.hits = 0
+        self.misses = 0
+        # Decisions are read and written from the background evaluation threads as well
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS job_fit (
+                    job_id TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    description_hash TEXT NOT NULL,
+                    title TEXT,
+                    description TEXT,
+                    decision INTEGER NOT NULL,
+                    evaluated REAL NOT NULL,
+                    source TEXT NOT NULL DEFAULT 'llm',
+                    PRIMARY KEY (job_id, fingerprint)
+                )
+            """)
+            try:
+                # Caches created before the prefilter have no source column; all their decisions came from the AI
+                self._connection.execute("ALTER TABLE job_fit ADD COLUMN source TEXT NOT NULL DEFAULT 'llm'")
+            except sqlite3.OperationalError:
+                pass
+            self._connection.execute("CREATE INDEX IF NOT EXISTS job_fit_description ON job_fit (description_hash, fingerprint)")
+            self._connection.execute("DELETE FROM job_fit WHERE evaluated < ?", (time.time() - self.ttl,))
+
+    @staticmethod
+    def description_hash(job_title, job_description):
+        return hashlib.sha256(f"{job_title}\n{job_description}".encode('utf-8')).hexdigest()
+
+    def _lookup(self, column, value):
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT decision FROM job_fit WHERE {column} = ? AND fingerprint = ? AND evaluated >= ? ORDER BY evaluated DESC",
+                (value, self.fingerprint, time.time() - self.ttl)).fetchone()
+        if row is None:
+            return None
+        return bool(row[0])
+
+    def get(self, job_id):
+        """Return the cached decision for a job ID without needing its description, or None."""
+        decision = self._lookup('job_id', job_id)
+        with self._lock:
+            if decision is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return decision
+
+    def peek(self, job_id):
+        """Like get(), but not counted as a hit or miss."""
+        return self._lookup('job_id', job_id)
+
+    def get_by_description(self, job_title, job_description):
+        """Return the cached decision for an identical posting under another job ID, or None."""
+        decision = self._lookup('description_hash', self.description_hash(job_title, job_description))
+        if decision is not None:
+            with self._lock:
+                # Counted as a hit in place of the miss recorded by get()
+                self.hits += 1
+                self.misses -= 1
+        return decision
+
+    def put(self, job_id, job_title, job_description, decision, source='llm'):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO job_fit (job_id, fingerprint, description_hash, title, description, decision, evaluated, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, self.fingerprint, self.description_hash(job_title, job_description), job_title, job_description,
+                 int(decision), time.time(), source))
+
+    def descriptions(self, limit=2000):
+        """The most recently stored job descriptions, used as the prefilter's document collection."""
+        with self._lock:
+            rows = self._connection.execute("SELECT description FROM job_fit WHERE description IS NOT NULL ORDER BY evaluated DESC LIMIT ?",
+                                            (limit,)).fetchall()
+        return [row[0] for row in rows]
+
+    def llm_verdicts(self):
+        """(title, description, decision) for every stored decision made by the AI."""
+        with self._lock:
+            rows = self._connection.execute("SELECT title, description, decision FROM job_fit WHERE source = 'llm' AND description IS NOT NULL").fetchall()
+        return [(title or '', description, bool(decision)) for title, description, decision in rows]
+
+    def stats(self):
+        return f"Job fit cache: {self.hits} hits, {self.misses} misses"
+
+class ResumeCache:
+    """
+    Parsed resume text and sections stored on disk, so the resume is only parsed again when it changes.
+
+    Entries are keyed by the file's SHA-256 hash. The path, size and modification time are stored too,
+    so an unchanged file is recognised without hashing it.
+    """
+    def __init__(self, path):
+        self._connection = sqlite3.connect(path, timeout=30)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    sha256 TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    content TEXT NOT NULL,
+                    sections TEXT NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def _file_hash(path):
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def get(self, path):
+        """Return (content, sections) for the resume at path, or None if it has not been parsed before."""
+        stat = os.stat(path)
+        row = self._connection.execute("SELECT content, sections FROM resumes WHERE path = ? AND size = ? AND mtime = ?",
+                                       (path, stat.st_size, stat.st_mtime)).fetchone()
+        if row is None:
+            # The file may have been copied or touched without changing
+            row = self._connection.execute("SELECT content, sections FROM resumes WHERE sha256 = ?",
+                                           (self._file_hash(path),)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put(self, path, content, sections):
+        stat = os.stat(path)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO resumes (sha256, path, size, mtime, content, sections) VALUES (?, ?, ?, ?, ?, ?)",
+                (self._file_hash(path), path, stat.st_size, stat.st_mtime, content, json.dumps(sections)))
+
+    def close(self):
+        self._connection.close()
+
+RESUME_SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'objective', 'about me'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core competencies', 'competencies', 'technologies', 'tools'),
+    'experience': ('experience', 'work experience', 'professional experience', 'relevant experience', 'employment',
+                   'employment history', 'work history', 'career history'),
+    'education': ('education', 'academic background', 'education and training'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'licenses & certifications', 'licenses and certifications'),
+    'projects': ('projects', 'selected projects', 'personal projects'),
+}
+
+RESUME_STOP_WORDS = {
+    'the', 'and', 'for', 'with', 'you', 'your', 'are', 'have', 'has', 'our', 'will', 'this', 'that', 'from', 'how',
+    'many', 'years', 'what', 'which', 'who', 'job', 'role', 'work', 'able', 'any', 'all', 'not', 'can', 'more'
+}
+
+def split_resume_sections(text):
+    """Split resume text into sections by common heading lines; text before the first heading is the summary."""
+    sections = {}
+    current_section = 'summary'
+    for line in text.splitlines():
+        heading = line.strip().strip(':').lower()
+        matched = next((name for name, headings in RESUME_SECTION_HEADINGS.items() if heading in headings), None)
+        if matched:
+            current_section = matched
+            continue
+        sections.setdefault(current_section, []).append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "".join(lines).strip()}
+
+def resume_chunks(sections, lines_per_chunk=8):
+    """Break each section into paragraphs (usually one per role or degree) for relevance selection."""
+    chunks = []
+    for section, text in sections.items():
+        paragraphs = [paragraph.strip() for paragraph in re.split(r'\n\s*\n', text) if paragraph.strip()]
+        if len(paragraphs) == 1:
+            # PDF extraction often drops blank lines, so fall back to fixed-size groups of lines
+            lines = text.splitlines()
+            paragraphs = ["\n".join(lines[i:i + lines_per_chunk]) for i in range(0, len(lines), lines_per_chunk)]
+        chunks += [(section, paragraph) for paragraph in paragraphs]
+    return chunks
+
+def resume_words(text):
+    return set(re.findall(r'[a-z][a-z0-9+#]+', text.lower())) - RESUME_STOP_WORDS
+
+class JobFitPrefilter:
+    """
+    Local lexical scorer that settles clear-cut job fit cases without calling the AI.
+
+    The requirement lines of a job description are reduced to words, each weighted by its inverse
+    document frequency across earlier job descriptions, so that words every posting uses count for
+    little. Coverage is the weighted share of those words found in the resume or the experience
+    section of config.yaml. Years of experience asked for are compared with the candidate's.
+    """
+    YEARS_PATTERN = re.compile(r'(\d{1,2})\s*\+?\s*(?:(?:-|to)\s*\d{1,2}\s*)?\+?\s*(?:years?|yrs?)\b', re.I)
+    REQUIREMENT_HEADING = re.compile(r'requirement|qualification|must have|you have|you bring|you.ll need|looking for|skills|experience', re.I)
+    RESUME_YEAR = re.compile(r'\b(19[6-9]\d|20\d\d)\b')
+
+    def __init__(self, resume_text, resume_chunks, experience, corpus=(), apply_score=0.6, skip_score=0.2, max_years_gap=2):
+        self.apply_score = apply_score
+        self.skip_score = skip_score
+        self.max_years_gap = max_years_gap
+
+        skills = [skill for skill, years in experience.items() if skill != 'default' and isinstance(years, int) and years > 0]
+        self.candidate_words = resume_words(resume_text) | resume_words(' '.join(skills))
+
+        # The longer of the longest experience entry in config.yaml and the span of years in the resume's experience section
+        configured_years = max([years for years in experience.values() if isinstance(years, int)] or [0])
+        experience_text = "\n".join(text for section, text in resume_chunks if section == 'experience')
+        resume_years = [int(year) for year in self.RESUME_YEAR.findall(experience_text)]
+        if re.search(r'\b(present|current)\b', experience_text, re.I):
+            resume_years.append(date.today().year)
+        self.candidate_years = max(configured_years, max(resume_years) - min(resume_years) if resume_years else 0)
+
+        self.documents = 0
+        self.document_frequency = Counter()
+        for description in corpus:
+            self.add_document(description)
+
+    def add_document(self, description):
+        self.documents += 1
+        self.document_frequency.update(resume_words(description))
+
+    def _idf(self, word):
+        return math.log((1 + self.documents) / (1 + self.document_frequency[word])) + 1
+
+    def requirement_text(self, job_description):
+        """The lines under requirement-like headings, or the whole description if there are none."""
+        lines = job_description.splitlines()
+        selected = []
+        in_requirements = False
+        for line in lines:
+            stripped = line.strip()
+            # Short lines that are not bullets and have no sentence ending are treated as headings
+            if stripped and len(stripped) < 60 and not stripped.endswith('.') and not stripped.startswith(('-', '•', '*', '·')):
+                if self.REQUIREMENT_HEADING.search(stripped):
+                    in_requirements = True
+                    continue
+                if stripped.endswith(':'):
+                    in_requirements = False
+            if in_requirements:
+                selected.append(line)
+        return "\n".join(selected) if selected else job_description
+
+    def score(self, job_title, job_description):
+        requirements = self.requirement_text(job_description)
+        words = resume_words(job_title + "\n" + requirements)
+        total = sum(self._idf(word) for word in words)
+        matched = sum(self._idf(word) for word in words if word in self.candidate_words)
+        coverage = matched / total if total else 0.0
+
+        required_years = [int(years) for years in self.YEARS_PATTERN.findall(requirements) if int(years) <= 20]
+        years_gap = (max(required_years) - self.candidate_years) if required_years else 0
+
+        if years_gap > self.max_years_gap or coverage < self.skip_score:
+            verdict = False
+        elif coverage >= self.apply_score and years_gap <= 0:
+            verdict = True
+        else:
+            verdict = None
+        return {'coverage': coverage, 'years_gap': years_gap, 'verdict': verdict}
+
+    def decide(self, job_title, job_description):
+        """Return True (APPLY) or False (SKIP) for clear cases, or None when the AI should decide."""
+        result = self.score(job_title, job_description)
+        return result['verdict']
+
+def evaluate_prefilter(ai_response_generator):
+    """Compare the prefilter's verdicts with the AI verdicts stored in the job fit cache."""
+    verdicts = ai_response_generator.job_fit_cache.llm_verdicts() if ai_response_generator.job_fit_cache else []
+    prefilter = ai_response_generator.prefilter
+    results = Counter()
+    for job_title, job_description, llm_decision in verdicts:
+        verdict = prefilter.decide(job_title, job_description)
+        if verdict is None:
+            results['borderline'] += 1
+        elif verdict == llm_decision:
+            results['agree_apply' if verdict else 'agree_skip'] += 1
+        else:
+            results['false_apply' if verdict else 'false_skip'] += 1
+
+    total = sum(results.values())
+    decided = total - results['borderline']
+    agreed = results['agree_apply'] + results['agree_skip']
+    print(f"Prefilter evaluation against {total} stored AI verdicts:")
+    print(f"  decided locally: {decided} ({100.0 * decided / total if total else 0:.0f}%), sent to AI: {results['borderline']}")
+    print(f"  agreement on decided jobs: {100.0 * agreed / decided if decided else 0:.1f}% "
+          f"(APPLY {results['agree_apply']} agreed, {results['false_apply']} disagreed; "
+          f"SKIP {results['agree_skip']} agreed, {results['false_skip']} disagreed)")
+    return results
+
+class LLMUnavailableError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open."""
+
+
+_shared_http_client = None
+_shared_http_client_lock = threading.Lock()
+
+
+def shared_http_client():
+    """One connection-pooled HTTP client for every LLM request made by this process."""
+    global _shared_http_client
+    with _shared_http_client_lock:
+        if _shared_http_client is None:
+            _shared_http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=60)
+            )
+        return _shared_http_client
+
+
+class OpenAIBackend:
+    """
+    Chat completion backend for OpenAI and OpenAI-compatible servers.
+
+    Every call gets a strict deadline: a single attempt is cut off after `timeout` seconds, and transient
+    errors (connection problems, timeouts, rate limits, server errors) are retried with jittered exponential
+    backoff only while the whole call stays within `max_retries` retries and twice the timeout. After
+    `breaker_failures` failed calls in a row the circuit breaker opens, and for `breaker_cooldown` seconds
+    calls raise LLMUnavailableError immediately so the bot falls back to its rule-based answers. The first
+    call after the cooldown is let through as a trial and closes the breaker again if it succeeds.
+    """
+
+    RETRYABLE_ERRORS = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError)
+
+    def __init__(self, api_key=None, base_url=None, model="gpt-3.5-turbo", timeout=20, max_retries=2,
+                 breaker_failures=5, breaker_cooldown=120):
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        # Local OpenAI-compatible servers usually accept any key, but the client refuses to start without one
+        self._client = OpenAI(api_key=api_key or "unused", base_url=base_url or None, max_retries=0,
+                              timeout=timeout, http_client=shared_http_client())
+        self._lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+        self.stats = Counter()
+
+    def _allow_request(self):
+        with self._lock:
+            if self._consecutive_failures < self.breaker_failures:
+                return True
+            if time.monotonic() < self._open_until or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def _record_result(self, success):
+        with self._lock:
+            self._trial_in_flight = False
+            if success:
+                self._consecutive_failures = 0
+                return
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.breaker_failures:
+                if time.monotonic() >= self._open_until:
+                    self.stats['breaker_opened'] += 1
+                    print(f"LLM backend failed {self._consecutive_failures} times in a row, "
+                          f"using rule-based answers for {self.breaker_cooldown}s")
+                self._open_until = time.monotonic() + self.breaker_cooldown
+
+    def complete(self, messages, max_tokens, temperature=0.7, json_mode=False):
+        """
+        Request a chat completion.
+
+        Args:
+            messages: Chat messages in the OpenAI format
+            max_tokens: Maximum number of completion tokens
+            temperature: Sampling temperature
+            json_mode: Ask the server for a JSON object response
+
+        Returns:
+            The chat completion response; raises LLMUnavailableError while the breaker is open
+        """
+        if not self._allow_request():
+            self.stats['short_circuited'] += 1
+            raise LLMUnavailableError("LLM backend is unavailable, circuit breaker is open")
+
+        kwargs = {"model": self.model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+
+        deadline = time.monotonic() + 2 * self.timeout
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            self.stats['attempts'] += 1
+            try:
+                response = self._client.chat.completions.create(timeout=max(1.0, min(self.timeout, remaining)), **kwargs)
+            except self.RETRYABLE_ERRORS as e:
+                # Full jitter: sleep a random time up to the exponential backoff step
+                backoff = random.uniform(0, min(8.0, 0.5 * 2 ** attempt))
+                if attempt >= self.max_retries or time.monotonic() + backoff >= deadline:
+                    self.stats['failures'] += 1
+                    self._record_result(False)
+                    raise
+                attempt += 1
+                self.stats['retries'] += 1
+                print(f"LLM request failed ({type(e).__name__}), retrying in {backoff:.1f}s")
+                time.sleep(backoff)
+                continue
+            except Exception:
+                # Bad requests and authentication errors will not get better by retrying
+                self.stats['failures'] += 1
+                self._record_result(False)
+                raise
+            self._record_result(True)
+            return response
+
 
 class AIResponseGenerator:
-    def __init__(self, api_key, personal_info, experience, languages, resume_path, text_resume_path=None, debug=False):
+    def __init__(self, api_key, personal_info, experience, languages, resume_path, text_resume_path=None, debug=False,
+                 cache_path=None, cache_size=5000, job_fit_ttl_days=30, job_fit_workers=4, resume_context_chars=4000,
+                 prefilter_settings=None, use_prefilter=False, llm_settings=None, metrics=None):
         self.personal_info = personal_info
         self.experience = experience
         self.languages = languages
         self.pdf_resume_path = resume_path
         self.text_resume_path = text_resume_path
+        self.cache_path = cache_path
+        self.resume_context_chars = resume_context_chars
         self._resume_content = None
-        self._client = OpenAI(api_key=api_key) if api_key else None
+        self._resume_chunks = []
+        self._resume_thread = None
+        # Keyword arguments for OpenAIBackend; a base URL alone is enough to use a local OpenAI-compatible server
+        llm_settings = llm_settings or {}
+        self._client = OpenAIBackend(api_key=api_key, **llm_settings) if api_key or llm_settings.get('base_url') else None
         self.debug = debug
+        self.token_usage = Counter()
+        self._usage_lock = threading.Lock()
+        self.metrics = metrics or RunMetrics()
+        self.answer_cache = None
+        self.job_fit_cache = None
+        self.job_fit_workers = job_fit_workers
+        self._job_fit_executor = None
+        # Keyword arguments for JobFitPrefilter; use_prefilter decides whether evaluate_job_fit consults it
+        # before the AI, while evaluate_prefilter uses the same settings either way
+        self.prefilter_settings = prefilter_settings
+        self.use_prefilter = use_prefilter
+        self._prefilter = None
+        self._prefilter_lock = threading.Lock()
+        if cache_path:
+            fingerprint = self.profile_fingerprint()
+            self.answer_cache = AnswerCache(cache_path, fingerprint, cache_size)
+            self.job_fit_cache = JobFitCache(cache_path, fingerprint, job_fit_ttl_days)
+        if self._client:
+            self.start_loading_resume()
+
+    def profile_fingerprint(self):
+        """Hash of everything that goes into the candidate context: the resume files and the profile from config.yaml."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([self.personal_info, self.experience, self.languages], sort_keys=True, default=str).encode('utf-8'))
+        for path in (self.text_resume_path, self.pdf_resume_path):
+            if path and os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        return digest.hexdigest()
+
+    def start_loading_resume(self):
+        """Parse the resume on a background thread so the first AI question does not stall an open application."""
+        if self._resume_thread is None:
+            self._resume_thread = threading.Thread(target=self._load_resume, name='resume-loader', daemon=True)
+            self._resume_thread.start()
+
     @property
     def resume_content(self):
-        if self._resume_content is None:
-            # First try to read from text resume if available
-            if self.text_resume_path:
-                try:
-                    with open(self.text_resume_path, 'r', encoding='utf-8') as f:
-                        self._resume_content = f.read()
-                        print("Successfully loaded text resume")
-                        return self._resume_content
-                except Exception as e:
-                    print(f"Could not read text resume: {str(e)}")
-
-            # Fall back to PDF resume if text resume fails or isn't available
-            try:
-                content = []
-                reader = PdfReader(self.pdf_resume_path)
-                for page in reader.pages:
-                    content.append(page.extract_text())
-                self._resume_content = "\n".join(content)
-                print("Successfully loaded PDF resume")
-            except Exception as e:
-                print(f"Could not extract text from resume PDF: {str(e)}")
-                self._resume_content = ""
+        self.start_loading_resume()
+        self._resume_thread.join()
         return self._resume_content
 
-    def _build_context(self):
+    @property
+    def resume_chunks(self):
+        self.start_loading_resume()
+        self._resume_thread.join()
+        return self._resume_chunks
+
+    def _load_resume(self):
+        resume_cache = ResumeCache(self.cache_path) if self.cache_path else None
+
+        # First try to read from text resume if available, falling back to the PDF resume
+        for path, reader in ((self.text_resume_path, self._read_text_resume), (self.pdf_resume_path, self._read_pdf_resume)):
+            if not path:
+                continue
+            try:
+                cached = resume_cache.get(path) if resume_cache else None
+                if cached is not None:
+                    self._resume_content, sections = cached
+                    print(f"Loaded parsed resume from cache: {path}")
+                else:
+                    self._resume_content = reader(path)
+                    sections = split_resume_sections(self._resume_content)
+                    if resume_cache:
+                        resume_cache.put(path, self._resume_content, sections)
+                self._resume_chunks = resume_chunks(sections)
+                break
+            except Exception as e:
+                print(f"Could not read resume {path}: {str(e)}")
+        else:
+            self._resume_content = ""
+            self._resume_chunks = []
+
+        if resume_cache:
+            resume_cache.close()
+
+    def _read_text_resume(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        print("Successfully loaded text resume")
+        return content
+
+    def _read_pdf_resume(self, path):
+        content = []
+        reader = PdfReader(path)
+        for page in reader.pages:
+            content.append(page.extract_text())
+        print("Successfully loaded PDF resume")
+        return "\n".join(content)
+
+    def _select_resume_context(self, query):
+        """Pick the resume chunks that share the most words with the query, within the context budget."""
+        chunks = self.resume_chunks
+        if not query or sum(len(text) for _, text in chunks) <= self.resume_context_chars:
+            return self.resume_content
+
+        query_words = resume_words(query)
+        # Skills always go in first, then the chunks most relevant to the question
+        ranked = sorted(enumerate(chunks), key=lambda item: (item[1][0] != 'skills', -len(query_words & resume_words(item[1][1])), item[0]))
+        selected = []
+        remaining = self.resume_context_chars
+        for index, (section, text) in ranked:
+            if len(text) > remaining:
+                continue
+            selected.append((index, section, text))
+            remaining -= len(text)
+
+        # Keep the chosen chunks in resume order, under their section headings
+        lines = []
+        current_section = None
+        for _, section, text in sorted(selected):
+            if section != current_section:
+                lines.append(f"{section.title()}:")
+                current_section = section
+            lines.append(text)
+        return "\n".join(lines)
+
+    def _build_context(self, query=None):
+        query_text = (query or '').lower()
+        skills = [f"{skill} ({years} yrs)" for skill, years in self.experience.items()
+                  if skill != 'default' and (not query or (isinstance(years, int) and years > 0) or skill.lower() in query_text)]
         return f"""
         Personal Information:
         - Name: {self.personal_info['First Name']} {self.personal_info['Last Name']}
         - Current Role: {self.experience.get('currentRole', '')}
-        - Skills: {', '.join(self.experience.keys())}
+        - Skills: {', '.join(skills)}
         - Languages: {', '.join(f'{lang}: {level}' for lang, level in self.languages.items())}
         - Professional Summary: {self.personal_info.get('MessageToManager', '')}
 
         Resume Content (Give the greatest weight to this information, if specified):
-        {self.resume_content}
+        {self._select_resume_context(query)}
         """
 
+    def _complete(self, **kwargs):
+        with self.metrics.stage('llm request'):
+            return self._client.complete(**kwargs)
+
+    def _record_usage(self, response):
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        with self._usage_lock:
+            self.token_usage['requests'] += 1
+            self.token_usage['prompt_tokens'] += usage.prompt_tokens
+            self.token_usage['completion_tokens'] += usage.completion_tokens
+        self.metrics.count('llm_requests')
+        self.metrics.count('llm_prompt_tokens', usage.prompt_tokens)
+        self.metrics.count('llm_completion_tokens', usage.completion_tokens)
+        print(f"AI request used {usage.prompt_tokens} prompt and {usage.completion_tokens} completion tokens")
+
     def generate_response(self, question_text, response_type="text", options=None, max_tokens=100):
         """
         Generate a response using OpenAI's API
@@ -78,9 +696,21 @@ class AIResponseGenerator:
         """
         if not self._client:
             return None
-            
+
+        if self.answer_cache:
+            cached_answer = self.answer_cache.get(question_text, response_type, options)
+            if cached_answer is not None:
+                print(f"Cached AI response: {cached_answer}")
+                return cached_answer
+
+        answer = self._generate_response(question_text, response_type, options, max_tokens)
+        if answer is not None and self.answer_cache:
+            self.answer_cache.put(question_text, response_type, options, answer)
+        return answer
+
+    def _generate_response(self, question_text, response_type, options, max_tokens):
         try:
-            context = self._build_context()
+            context = self._build_context(question_text + ' ' + ' '.join(text for _, text in options or []))
             
             system_prompt = {
                 "text": "You are a helpful assistant answering job application questions professionally and concisely. Use the candidate's background information and resume to personalize responses.",
@@ -93,8 +723,7 @@ class AIResponseGenerator:
                 options_text = "\n".join([f"{idx}: {text}" for idx, text in options])
                 user_content += f"\n\nSelect the most appropriate answer by providing its index number from these options:\n{options_text}"
 
-            response = self._client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            response = self._complete(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_content}
@@ -103,47 +732,209 @@ class AIResponseGenerator:
                 temperature=0.7
             )
             
+            self._record_usage(response)
             answer = response.choices[0].message.content.strip()
-            print(f"AI response: {answer}")  # TODO: Put logging behind a debug flag
+            if self.debug:
+                print(f"AI response: {answer}")
             
-            if response_type == "numeric":
-                # Extract first number from response
-                numbers = re.findall(r'\d+', answer)
-                if numbers:
-                    return int(numbers[0])
-                return 0
-            elif response_type == "choice":
-                # Extract the index number from the response
-                numbers = re.findall(r'\d+', answer)
-                if numbers and options:
-                    index = int(numbers[0])
-                    # Ensure index is within valid range
-                    if 0 <= index < len(options):
-                        return index
-                return None  # Return None if the index is not within the valid range
-                
-            return answer
+            # An unparseable answer is returned as None, not a fallback value, so it is never cached
+            return self._parse_answer(answer, response_type, options)
             
         except Exception as e:
             print(f"Error using AI to generate response: {str(e)}")
             return None
 
-    def evaluate_job_fit(self, job_title, job_description):
+    @staticmethod
+    def _parse_answer(answer, response_type, options):
+        """Convert a raw model answer to a number, a valid option index or text, or None if it is invalid."""
+        if response_type == "numeric":
+            # Extract first number from response
+            numbers = re.findall(r'\d+', answer)
+            if numbers:
+                return int(numbers[0])
+            return None
+        elif response_type == "choice":
+            # Extract the index number from the response
+            numbers = re.findall(r'\d+', answer)
+            if numbers and options:
+                index = int(numbers[0])
+                # Ensure index is within valid range
+                if 0 <= index < len(options):
+                    return index
+            return None  # Return None if the index is not within the valid range
+
+        return answer
+
+    def generate_responses(self, questions, max_tokens_per_question=100):
+        """
+        Answer several application questions with a single request
+
+        Args:
+            questions: A list of dicts with an "id", the question "text", its "response_type" and, for
+                       "choice" questions, its "options" as (index, text) tuples
+            max_tokens_per_question: Response length allowed for each question
+
+        Returns:
+            dict: Question id to answer, in the same form generate_response returns. Questions the batched
+                  response did not answer validly are asked again one at a time.
+        """
+        if not self._client:
+            return {question['id']: None for question in questions}
+
+        answers = {}
+        pending = []
+        for question in questions:
+            cached_answer = self.answer_cache.get(question['text'], question['response_type'], question.get('options')) if self.answer_cache else None
+            if cached_answer is not None:
+                print(f"Cached AI response: {cached_answer}")
+                answers[question['id']] = cached_answer
+            else:
+                pending.append(question)
+
+        if len(pending) > 1:
+            batch_answers = self._generate_batch_response(pending, max_tokens_per_question)
+            for question in pending:
+                answer = batch_answers.get(question['id'])
+                if answer is not None:
+                    answers[question['id']] = answer
+                    if self.answer_cache:
+                        self.answer_cache.put(question['text'], question['response_type'], question.get('options'), answer)
+
+        for question in pending:
+            if question['id'] not in answers:
+                answer = self._generate_response(question['text'], question['response_type'], question.get('options'), max_tokens_per_question)
+                if answer is not None and self.answer_cache:
+                    self.answer_cache.put(question['text'], question['response_type'], question.get('options'), answer)
+                answers[question['id']] = answer
+        return answers
+
+    def _generate_batch_response(self, questions, max_tokens_per_question):
+        try:
+            context = self._build_context(' '.join(
+                question['text'] + ' ' + ' '.join(text for _, text in question.get('options') or []) for question in questions))
+
+            system_prompt = """You are a helpful assistant answering several job application questions at once. Use the candidate's background information and resume to personalize responses.
+            Reply with a JSON object that maps each question id to its answer:
+            - "text" questions: a professional, concise answer as a string
+            - "numeric" questions: a single number
+            - "choice" questions: the index number of the most appropriate option
+            No explanation needed."""
+
+            question_lines = []
+            for question in questions:
+                question_lines.append(f'Question id "{question["id"]}" ({question["response_type"]}): {question["text"]}')
+                if question['response_type'] == "choice" and question.get('options'):
+                    question_lines += [f"  {idx}: {text}" for idx, text in question['options']]
+
+            user_content = f"Using this candidate's background and resume:\n{context}\n\nPlease answer these job application questions:\n" + "\n".join(question_lines)
+
+            response = self._complete(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content}
+                ],
+                max_tokens=max_tokens_per_question * len(questions),
+                temperature=0.7,
+                json_mode=True
+            )
+
+            self._record_usage(response)
+            raw_answers = json.loads(response.choices[0].message.content)
+            if self.debug:
+                print(f"AI batch response: {raw_answers}")
+            if not isinstance(raw_answers, dict):
+                raise ValueError(f"expected a JSON object of answers, got {type(raw_answers).__name__}")
+        except Exception as e:
+            print(f"Error using AI to generate batch response, asking questions one at a time: {str(e)}")
+            return {}
+
+        answers = {}
+        for question in questions:
+            raw_answer = raw_answers.get(str(question['id']))
+            if raw_answer is None:
+                continue
+            answer = self._parse_answer(str(raw_answer).strip(), question['response_type'], question.get('options'))
+            if answer is not None and answer != '':
+                answers[question['id']] = answer
+        return answers
+
+    def cached_job_fit(self, job_id, counted=True):
+        """
+        Look up an earlier job fit decision for a job ID, so the description does not need to be read again
+
+        Args:
+            job_id: The canonical job ID
+            counted: Whether the lookup counts towards the cache's hit rate
+
+        Returns:
+            bool or None: The cached decision, or None if the job has to be evaluated
+        """
+        if not self.job_fit_cache or job_id is None:
+            return None
+        return self.job_fit_cache.get(job_id) if counted else self.job_fit_cache.peek(job_id)
+
+    @property
+    def prefilter(self):
+        with self._prefilter_lock:
+            if self._prefilter is None:
+                corpus = self.job_fit_cache.descriptions() if self.job_fit_cache else []
+                self._prefilter = JobFitPrefilter(self.resume_content, self.resume_chunks, self.experience, corpus,
+                                                  **(self.prefilter_settings or {}))
+            return self._prefilter
+
+    def submit_job_fit(self, job_title, job_description, job_id=None):
+        """
+        Run evaluate_job_fit on a bounded background thread pool
+
+        Returns:
+            Future: Resolves to the same value evaluate_job_fit returns
+        """
+        if self._job_fit_executor is None:
+            self._job_fit_executor = ThreadPoolExecutor(max_workers=self.job_fit_workers, thread_name_prefix='job-fit')
+        return self._job_fit_executor.submit(self.evaluate_job_fit, job_title, job_description, job_id)
+
+    def evaluate_job_fit(self, job_title, job_description, job_id=None):
         """
         Evaluate whether a job is worth applying to based on the candidate's experience and the job requirements
         
         Args:
             job_title: The title of the job posting
             job_description: The full job description text
+            job_id: The canonical job ID, used to cache the decision
             
         Returns:
             bool: True if should apply, False if should skip
         """
+        if self.use_prefilter:
+            decision = self.prefilter.decide(job_title, job_description)
+            if decision is not None:
+                print(f"Prefilter evaluation: {'APPLY' if decision else 'SKIP'}")
+                if self.job_fit_cache and job_id is not None:
+                    self.job_fit_cache.put(job_id, job_title, job_description, decision, source='prefilter')
+                return decision
+
         if not self._client:
             return True  # Proceed with application if AI not available
-            
+
+        if self.job_fit_cache:
+            cached_decision = self.job_fit_cache.get_by_description(job_title, job_description)
+            if cached_decision is not None:
+                print(f"Cached AI evaluation: {'APPLY' if cached_decision else 'SKIP'}")
+                if job_id is not None:
+                    self.job_fit_cache.put(job_id, job_title, job_description, cached_decision)
+                return cached_decision
+
+        decision = self._evaluate_job_fit(job_title, job_description)
+        if decision is None:
+            return True  # Proceed with application if evaluation fails
+
+        if self.job_fit_cache and job_id is not None:
+            self.job_fit_cache.put(job_id, job_title, job_description, decision)
+        return decision
+
+    def _evaluate_job_fit(self, job_title, job_description):
         try:
-            context = self._build_context()
+            context = self._build_context(f"{job_title}\n{job_description}")
             
             system_prompt = """You are evaluating job fit for technical roles. 
             Recommend APPLY if:
@@ -171,8 +962,7 @@ class AIResponseGenerator:
             else:
                 system_prompt += """Return only APPLY or SKIP."""
 
-            response = self._client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            response = self._complete(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Job: {job_title}\n{job_description}\n\nCandidate:\n{context}"}
@@ -181,13 +971,1438 @@ class AIResponseGenerator:
                 temperature=0.2  # Lower temperature for more consistent decisions
             )
             
+            self._record_usage(response)
             answer = response.choices[0].message.content.strip()
             print(f"AI evaluation: {answer}")
             return answer.upper().startswith('A')  # True for APPLY, False for SKIP
             
         except Exception as e:
             print(f"Error evaluating job fit: {str(e)}")
-            return True  # Proceed with application if evaluation fails
+            return None
+
+JOB_ID_PATTERNS = [
+    re.compile(r'^(\d+)$'),
+    re.compile(r'urn:li:[A-Za-z_]*jobPosting:(\d+)'),
+    # Job links either end in the ID or in a slug of the title followed by the ID
+    re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)(?:[/?#]|$)'),
+    re.compile(r'currentJobId=(\d+)')
+]
+
+def get_job_id(value):
+    """
+    Return the canonical LinkedIn job ID for a tile's job ID, a job URN or a job link, or the bare link if
+    none can be found. The same posting found through different searches always gets the same ID.
+    """
+    if not value:
+        return None
+    value = str(value).strip()
+    for pattern in JOB_ID_PATTERNS:
+        match = pattern.search(value)
+        if match:
+            return match.group(1)
+    return value.split('?')[0]
+
+def compact_job_id(job_id):
+    """Numeric job IDs are held in memory as ints, which take about half the memory of the strings."""
+    return int(job_id) if job_id.isdigit() else job_id
+
+# Column names and SQLite types of the append-only result tables written through ResultWriter
+RESULT_SCHEMAS = {
+    'job_events': (('job_id', 'TEXT'), ('state', 'TEXT'), ('timestamp', 'TEXT'))
+}
+RESULT_TYPES = {'TEXT': str, 'INTEGER': int, 'REAL': float}
+
+class ResultWriter:
+    """
+    Buffered writer for the append-only result tables in the ledger file.
+
+    Rows are checked against RESULT_SCHEMAS, appended to a write-ahead journal and kept in memory until
+    flush_rows rows are waiting or flush_seconds have passed, then inserted in one transaction. Rows left
+    in the journal by a run that crashed are inserted when the writer is opened again, so nothing is lost.
+    """
+    def __init__(self, path, journal_path, flush_rows=50, flush_seconds=30):
+        self.path = path
+        self.journal_path = journal_path
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        for table, columns in RESULT_SCHEMAS.items():
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(f'{name} {kind}' for name, kind in columns)})")
+        self._connection.commit()
+        self._recover()
+        self._journal = open(journal_path, 'a', encoding='utf-8')
+
+    def _recover(self):
+        if not os.path.isfile(self.journal_path):
+            return
+        rows = []
+        with open(self.journal_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    rows.append((entry['table'], entry['row']))
+                except (ValueError, KeyError):
+                    # The last line may be cut short if the crash happened while writing it
+                    continue
+        # Journals written by older versions may hold rows for tables that are no longer result tables,
+        # such as unprepared_questions before the UnpreparedQuestionIndex replaced it
+        dropped = [table for table, _ in rows if table not in RESULT_SCHEMAS]
+        rows = [(table, row) for table, row in rows if table in RESULT_SCHEMAS]
+        self._insert(rows)
+        os.remove(self.journal_path)
+        if rows:
+            print(f"Recovered {len(rows)} unsaved results from {self.journal_path}")
+        if dropped:
+            print(f"Dropped {len(dropped)} journal rows for retired tables: {', '.join(sorted(set(dropped)))}")
+
+    @staticmethod
+    def typed_row(table, fields):
+        columns = RESULT_SCHEMAS[table]
+        unknown = set(fields) - {name for name, _ in columns}
+        if unknown:
+            raise ValueError(f"Unknown columns for {table}: {', '.join(sorted(unknown))}")
+        return [None if fields.get(name) is None else RESULT_TYPES[kind](fields[name]) for name, kind in columns]
+
+    def write(self, table, **fields):
+        self.append(table, fields)
+        self.flush_if_due()
+
+    def append(self, table, fields):
+        """Journal and buffer a row without flushing, for callers in the middle of their own transaction."""
+        row = self.typed_row(table, fields)
+        with self._lock:
+            self._journal.write(json.dumps({'table': table, 'row': row}, ensure_ascii=False) + "\n")
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._buffer.append((table, row))
+
+    def flush_if_due(self):
+        if len(self._buffer) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def _insert(self, rows):
+        with self._connection:
+            for table, row in rows:
+                placeholders = ','.join('?' * len(RESULT_SCHEMAS[table]))
+                self._connection.execute(f"INSERT INTO {table} VALUES ({placeholders})", row)
+
+    def flush(self):
+        """Insert the buffered rows and empty the journal."""
+        with self._lock:
+            if self._buffer:
+                self._insert(self._buffer)
+                self._buffer = []
+                self._journal.truncate(0)
+                self._journal.seek(0)
+            self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._journal.close()
+        if os.path.isfile(self.journal_path) and os.path.getsize(self.journal_path) == 0:
+            os.remove(self.journal_path)
+        self._connection.close()
+
+def export_history(ledger_path, destination, file_format='sqlite'):
+    """
+    Copy every table of the ledger file to destination for analysis: a standalone SQLite file, or a
+    directory with one Parquet file per table (needs pyarrow).
+    """
+    source = sqlite3.connect(ledger_path, timeout=30)
+    if file_format == 'sqlite':
+        target = sqlite3.connect(destination)
+        source.backup(target)
+        target.close()
+        source.close()
+        print(f"Exported {ledger_path} to {destination}")
+        return
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        source.close()
+        raise SystemExit("Exporting to Parquet needs pyarrow: python3 -m pip install pyarrow")
+    os.makedirs(destination, exist_ok=True)
+    tables = [row[0] for row in source.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    for table in tables:
+        cursor = source.execute(f"SELECT * FROM {table}")
+        columns = [column[0] for column in cursor.description]
+        data = cursor.fetchall()
+        arrow_table = pyarrow.table({name: [row[i] for row in data] for i, name in enumerate(columns)})
+        pyarrow.parquet.write_table(arrow_table, os.path.join(destination, f"{table}.parquet"))
+        print(f"Exported {len(data)} rows of {table} to {os.path.join(destination, table + '.parquet')}")
+    source.close()
+
+class UnpreparedQuestionIndex:
+    """
+    Counts the questions config.yaml has no answer for, one entry per normalized question.
+
+    Each entry holds how often the question was asked, its answer type, when it was first and last seen,
+    the options offered and the answer that was used in the end. Entries are kept in memory and merged
+    into the unprepared_question_index table of the ledger file once flush_seconds have passed, between
+    form steps so a question and its answer are always flushed together.
+    """
+    def __init__(self, path, flush_seconds=30):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self._entries = {}
+        self._last_flush = time.monotonic()
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS unprepared_question_index (
+                question_key TEXT PRIMARY KEY,
+                question TEXT NOT NULL,
+                answer_type TEXT,
+                count INTEGER NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                options TEXT,
+                answer TEXT
+            );
+            CREATE INDEX IF NOT EXISTS unprepared_question_index_count ON unprepared_question_index (count);
+        """)
+        self._connection.commit()
+
+    def record(self, answer_type, question_text):
+        """Count one sighting of the question and return its key."""
+        key = AnswerCache.normalize(question_text)
+        now = datetime.now().isoformat(timespec='seconds')
+        entry = self._entries.setdefault(key, {'question': question_text, 'answer_type': answer_type, 'count': 0,
+                                               'first_seen': now, 'options': [], 'answer': None})
+        entry['count'] += 1
+        entry['last_seen'] = now
+        entry['answer_type'] = answer_type
+        return key
+
+    def add_details(self, key, options=None, answer=None):
+        """Add the options offered for a recorded question and the answer that was filled in."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        for option in options or []:
+            if option not in entry['options']:
+                entry['options'].append(option)
+        if answer is not None:
+            entry['answer'] = str(answer)
+
+    def flush_if_due(self):
+        if time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        """Merge the counts gathered since the last flush into the table."""
+        with self._connection:
+            for key, entry in self._entries.items():
+                row = self._connection.execute(
+                    "SELECT count, first_seen, options, answer FROM unprepared_question_index WHERE question_key = ?", (key,)).fetchone()
+                if row is None:
+                    count, first_seen, options, answer = entry['count'], entry['first_seen'], entry['options'], entry['answer']
+                else:
+                    count = row[0] + entry['count']
+                    first_seen = min(row[1], entry['first_seen'])
+                    options = json.loads(row[2]) if row[2] else []
+                    options += [option for option in entry['options'] if option not in options]
+                    answer = entry['answer'] or row[3]
+                self._connection.execute("""
+                    INSERT OR REPLACE INTO unprepared_question_index
+                        (question_key, question, answer_type, count, first_seen, last_seen, options, answer)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (key, entry['question'], entry['answer_type'], count, first_seen, entry['last_seen'],
+                      json.dumps(options, ensure_ascii=False), answer))
+        self._entries = {}
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self._connection.close()
+
+def unprepared_question_report(ledger_path, limit=30):
+    """Print the questions config.yaml could not answer, most frequent first."""
+    connection = sqlite3.connect(ledger_path, timeout=30)
+    try:
+        rows = connection.execute("""
+            SELECT count, answer_type, question, answer, options, last_seen FROM unprepared_question_index
+            ORDER BY count DESC, last_seen DESC LIMIT ?
+        """, (limit,)).fetchall()
+        total = connection.execute("SELECT COUNT(*), COALESCE(SUM(count), 0) FROM unprepared_question_index").fetchone()
+    except sqlite3.OperationalError:
+        rows, total = [], (0, 0)
+    connection.close()
+
+    print(f"{total[0]} unprepared questions asked {total[1]} times in {ledger_path}. "
+          f"Answering the top ones in config.yaml saves the most AI calls.")
+    print(f"{'count':>6}  {'type':<9} question")
+    for count, answer_type, question, answer, options, last_seen in rows:
+        print(f"{count:>6}  {answer_type or '':<9} {question}")
+        details = []
+        if options and options != '[]':
+            details.append(f"options: {', '.join(json.loads(options))}")
+        if answer:
+            details.append(f"last answer: {answer}")
+        details.append(f"last seen {last_seen}")
+        print(f"{'':>17} {'; '.join(details)}")
+    return rows
+
+class ApplicationLedger:
+    """
+    SQLite-backed record of every job the bot has handled, keyed by the canonical job ID.
+
+    The current state of each job lives in the jobs table, and every state change is appended to
+    job_events with its timestamp through the ResultWriter. Handled job IDs are also held in memory so that the check done
+    before clicking a tile is a set lookup.
+
+    Several worker processes can share one ledger file. A worker claims a job before opening it, and
+    a job claimed by another live worker is left alone. Claims are owned by the worker's name rather
+    than its process, so a worker restarted after a crash takes its own earlier claims back at once.
+    """
+    STATES = ('seen', 'evaluated', 'declined', 'applied', 'applied_earlier', 'failed', 'skipped')
+    # 'applied' jobs were submitted by the bot and count towards the pacing limits; 'applied_earlier' jobs already
+    # carried LinkedIn's applied badge when the bot found them.
+    # Jobs in these states are not clicked again on later runs; 'seen' and 'evaluated' jobs are retried.
+    # 'declined' jobs were turned down by the job fit evaluation and are retried too: the JobFitCache skips them
+    # without a click until its verdict expires or the resume or config changes, and then they are evaluated again.
+    HANDLED_STATES = ('applied', 'applied_earlier', 'failed', 'skipped')
+    # Claims older than this are assumed to belong to a worker that died
+    CLAIM_TIMEOUT = 30 * 60
+
+    def __init__(self, path, writer, worker_name=None):
+        self.path = path
+        self.writer = writer
+        self.owner = f"{socket.gethostname()}:{worker_name or os.getpid()}"
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                title TEXT,
+                company TEXT,
+                link TEXT,
+                location TEXT,
+                search_location TEXT,
+                first_seen TEXT NOT NULL,
+                updated TEXT NOT NULL,
+                owner TEXT
+            );
+            CREATE TABLE IF NOT EXISTS job_events (
+                job_id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                timestamp TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS job_events_job_id ON job_events (job_id);
+        """)
+        try:
+            # Ledgers created before workers could share them have no owner column
+            self._connection.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        except sqlite3.OperationalError:
+            pass
+        placeholders = ','.join('?' * len(self.HANDLED_STATES))
+        rows = self._connection.execute(f"SELECT job_id FROM jobs WHERE state IN ({placeholders})", self.HANDLED_STATES)
+        self._handled = {compact_job_id(row[0]) for row in rows}
+        print(f"Loaded {len(self._handled)} previously handled jobs from {path}")
+
+    def is_handled(self, job_id):
+        if compact_job_id(job_id) in self._handled:
+            return True
+        # Other workers may share this ledger, so fall back to an indexed lookup
+        if self.state(job_id) in self.HANDLED_STATES:
+            self._handled.add(compact_job_id(job_id))
+            return True
+        return False
+
+    def claim(self, job_id, title=None, company=None, link=None, location=None, search_location=None):
+        """
+        Record the job as seen by this worker, unless it was handled already or another worker is working on it.
+
+        Returns True if this worker may go ahead with the job.
+        """
+        now = datetime.now()
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._connection.execute("SELECT state, owner, updated FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is not None:
+                state, owner, updated = row
+                if state in self.HANDLED_STATES:
+                    self._handled.add(compact_job_id(job_id))
+                    self._connection.rollback()
+                    return False
+                claim_age = (now - datetime.fromisoformat(updated)).total_seconds()
+                if owner not in (None, self.owner) and claim_age < self.CLAIM_TIMEOUT:
+                    self._connection.rollback()
+                    return False
+            self._write(job_id, 'seen', title, company, link, location, search_location, now)
+            self._connection.commit()
+        except Exception:
+            self._connection.rollback()
+            raise
+        self.writer.flush_if_due()
+        return True
+
+    def state(self, job_id):
+        row = self._connection.execute("SELECT state FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def applied_since(self, since):
+        """Number of jobs the bot applied to since the given datetime, by any worker."""
+        return self._connection.execute("SELECT COUNT(*) FROM jobs WHERE state = 'applied' AND updated >= ?",
+                                        (since.isoformat(timespec='seconds'),)).fetchone()[0]
+
+    def record(self, job_id, state, title=None, company=None, link=None, location=None, search_location=None):
+        if state not in self.STATES:
+            raise ValueError(f"Unknown job state: {state}")
+
+        with self._connection:
+            self._write(job_id, state, title, company, link, location, search_location, datetime.now())
+        self.writer.flush_if_due()
+
+        if state in self.HANDLED_STATES:
+            self._handled.add(compact_job_id(job_id))
+
+    def _write(self, job_id, state, title, company, link, location, search_location, now):
+        now = now.isoformat(timespec='seconds')
+        self._connection.execute("""
+            INSERT INTO jobs (job_id, state, title, company, link, location, search_location, first_seen, updated, owner)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (job_id) DO UPDATE SET
+                state = excluded.state,
+                title = COALESCE(excluded.title, jobs.title),
+                company = COALESCE(excluded.company, jobs.company),
+                link = COALESCE(excluded.link, jobs.link),
+                location = COALESCE(excluded.location, jobs.location),
+                search_location = COALESCE(excluded.search_location, jobs.search_location),
+                updated = excluded.updated,
+                owner = excluded.owner
+        """, (job_id, state, title, company, link, location, search_location, now, now, self.owner))
+        self.writer.append('job_events', {'job_id': job_id, 'state': state, 'timestamp': now})
+
+    def close(self):
+        self._connection.close()
+
+class SearchScheduler:
+    """
+    Orders the (position, location) searches by their yield, the number of new eligible Easy Apply jobs
+    per results page, and decides when to stop paging a search.
+
+    Yield is kept per search as an exponentially weighted average in the search_yield table of the
+    ledger file, so it carries over between runs. Productive searches come first more often, searches
+    whose yield fell below min_yield are only revisited every revisit_hours, and a search is abandoned
+    after unproductive_pages results pages in a row below min_yield.
+    """
+    # Weight of the latest page in the yield average
+    SMOOTHING = 0.3
+
+    def __init__(self, path, min_yield=1, unproductive_pages=2, revisit_hours=24):
+        self.min_yield = min_yield
+        self.unproductive_pages = unproductive_pages
+        self.revisit_hours = revisit_hours
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS search_yield (
+                position TEXT NOT NULL,
+                location TEXT NOT NULL,
+                yield REAL NOT NULL,
+                pages INTEGER NOT NULL,
+                eligible INTEGER NOT NULL,
+                applied INTEGER NOT NULL,
+                last_run TEXT NOT NULL,
+                PRIMARY KEY (position, location)
+            )
+        """)
+        self._connection.commit()
+
+    def history(self):
+        rows = self._connection.execute("SELECT position, location, yield, pages, eligible, applied, last_run FROM search_yield")
+        return {(row[0], row[1]): {'yield': row[2], 'pages': row[3], 'eligible': row[4], 'applied': row[5],
+                                   'last_run': datetime.fromisoformat(row[6])} for row in rows}
+
+    def plan(self, searches):
+        """
+        Return the searches to run this time, most productive first. The order is a weighted shuffle, so
+        searches with similar yields still take turns; searches never run before get the best known yield.
+        """
+        history = self.history()
+        known_yields = [entry['yield'] for entry in history.values()]
+        optimistic_yield = max(known_yields + [self.min_yield, 1])
+        now = datetime.now()
+        planned = []
+        for search in searches:
+            entry = history.get(search)
+            if entry is None:
+                weight = optimistic_yield
+            else:
+                hours_since_run = (now - entry['last_run']).total_seconds() / 3600
+                if entry['yield'] < self.min_yield and hours_since_run < self.revisit_hours:
+                    print(f"Skipping the search for {search[0]} in {search[1]}: {entry['yield']:.1f} new jobs per page, "
+                          f"revisited {self.revisit_hours - hours_since_run:.0f} hours from now.")
+                    continue
+                weight = entry['yield']
+            # Weighted random order: higher weights tend to come first
+            planned.append((random.random() ** (1 / max(weight, 0.05)), search))
+        planned.sort(reverse=True)
+        return [search for _, search in planned]
+
+    def record_page(self, position, location, eligible, applied):
+        """Fold one results page into the yield of its search."""
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._connection:
+            self._connection.execute("""
+                INSERT INTO search_yield (position, location, yield, pages, eligible, applied, last_run)
+                VALUES (?, ?, ?, 1, ?, ?, ?)
+                ON CONFLICT (position, location) DO UPDATE SET
+                    yield = ? * excluded.yield + ? * search_yield.yield,
+                    pages = search_yield.pages + 1,
+                    eligible = search_yield.eligible + excluded.eligible,
+                    applied = search_yield.applied + excluded.applied,
+                    last_run = excluded.last_run
+            """, (position, location, float(eligible), eligible, applied, now, self.SMOOTHING, 1 - self.SMOOTHING))
+
+    def keep_paging(self, page_yields):
+        """False once the last unproductive_pages pages of a search each had fewer than min_yield new eligible jobs."""
+        recent = page_yields[-self.unproductive_pages:]
+        return len(recent) < self.unproductive_pages or any(count >= self.min_yield for count in recent)
+
+    def close(self):
+        self._connection.close()
+
+def chrome_rss_mb(driver):
+    """Resident memory of the Chrome processes started by this driver in MB, or None if it can't be measured."""
+    if psutil is None:
+        return None
+    try:
+        service_process = psutil.Process(driver.service.process.pid)
+        return sum(child.memory_info().rss for child in service_process.children(recursive=True)) / (1024 * 1024)
+    except Exception:
+        return None
+
+# Navigation timing of the current page in milliseconds, or null before the load event
+PAGE_LOAD_TIMING_SCRIPT = """
+const navigation = performance.getEntriesByType('navigation')[0];
+if (!navigation || !navigation.loadEventEnd) return null;
+return {dom_content_loaded: navigation.domContentLoadedEventEnd, load: navigation.loadEventEnd};
+"""
+
+class RunMetrics:
+    """
+    Stage timers and counters for a run.
+
+    Every timed stage is summed per name for the summary table printed at exit and, when an events file is
+    configured, written to it as one JSON line. With a trace file, stages are also kept as Chrome trace
+    events and written when the run ends, so the run can be opened in chrome://tracing or Perfetto.
+    WebDriver commands are counted by wrapping the driver's execute method, which also measures the time
+    lost to implicit waits on elements that were never found.
+    """
+    MAX_TRACE_EVENTS = 200000
+
+    def __init__(self, events_path=None, trace_path=None):
+        self.stages = {}
+        self.counters = Counter()
+        self.trace_path = trace_path
+        self._trace_events = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._events = open(events_path, 'a', encoding='utf-8', buffering=1) if events_path else None
+
+    @contextmanager
+    def stage(self, name, **fields):
+        """Time the enclosed block as the named stage. Extra fields are written with its event."""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._record_stage(name, start, time.perf_counter() - start, error, fields)
+
+    def _record_stage(self, name, start, seconds, error, fields):
+        with self._lock:
+            stat = self.stages.setdefault(name, {'count': 0, 'seconds': 0.0, 'max': 0.0, 'errors': 0})
+            stat['count'] += 1
+            stat['seconds'] += seconds
+            stat['max'] = max(stat['max'], seconds)
+            stat['errors'] += int(error is not None)
+            if self.trace_path and len(self._trace_events) < self.MAX_TRACE_EVENTS:
+                self._trace_events.append({
+                    'name': name, 'cat': 'stage', 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                    'ts': round((start - self._origin) * 1e6), 'dur': round(seconds * 1e6), 'args': fields
+                })
+        self.event('stage', name=name, seconds=round(seconds, 4), error=error, **fields)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def event(self, kind, **fields):
+        """Write one JSON line to the events file, if there is one."""
+        if self._events is None:
+            return
+        line = json.dumps({'time': datetime.now().isoformat(timespec='milliseconds'), 'pid': os.getpid(),
+                           'kind': kind, **fields}, default=str)
+        with self._lock:
+            self._events.write(line + "\n")
+
+    def instrument_driver(self, driver):
+        """
+        Count every WebDriver command sent through driver, and the implicit waits spent on missing elements.
+
+        The implicit wait in force is followed through the setTimeouts commands, so lookups made while it is
+        switched off (optional lookups and readiness polls) are not counted as misses.
+        """
+        execute = getattr(driver, 'execute', None)
+        if execute is None:
+            return
+        # init_browser sets the implicit wait before the driver is instrumented
+        implicit_wait = {'ms': IMPLICIT_WAIT_SECONDS * 1000}
+
+        def counted_execute(driver_command, params=None):
+            self.count('webdriver_calls')
+            self.count(f'webdriver {driver_command}')
+            if driver_command == 'setTimeouts' and params and 'implicit' in params:
+                implicit_wait['ms'] = params['implicit']
+            waits = implicit_wait['ms'] > 0
+            start = time.perf_counter()
+            try:
+                response = execute(driver_command, params)
+            except NoSuchElementException:
+                if waits and driver_command in ('findElement', 'findChildElement'):
+                    self.count_implicit_wait_miss(time.perf_counter() - start)
+                raise
+            # find_elements waits out the implicit wait too before returning an empty list
+            if (waits and driver_command in ('findElements', 'findChildElements')
+                    and isinstance(response, dict) and response.get('value') == []):
+                self.count_implicit_wait_miss(time.perf_counter() - start)
+            return response
+        driver.execute = counted_execute
+
+    def count_implicit_wait_miss(self, seconds):
+        self.count('implicit_wait_misses')
+        self.count('implicit_wait_miss_seconds', seconds)
+
+    def summary(self):
+        lines = ["Stage times (stage, count, total seconds, mean, max, errors):"]
+        for name, stat in sorted(self.stages.items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"  {name:<28} {stat['count']:>6} {stat['seconds']:>10.1f} "
+                         f"{stat['seconds'] / stat['count']:>8.2f} {stat['max']:>8.2f} {stat['errors']:>6}")
+        commands = sorted(((name[len('webdriver '):], count) for name, count in self.counters.items()
+                           if name.startswith('webdriver ')), key=lambda item: -item[1])
+        if commands:
+            lines.append(f"  WebDriver calls: {self.counters['webdriver_calls']} ("
+                         + ", ".join(f"{name} {count}" for name, count in commands[:8]) + ")")
+        if self.counters['implicit_wait_misses']:
+            lines.append(f"  Implicit wait misses: {self.counters['implicit_wait_misses']}, "
+                         f"{self.counters['implicit_wait_miss_seconds']:.1f}s lost")
+        if self.counters['zero_wait_misses']:
+            # Each of these misses would have cost the full implicit wait before optional lookups switched it off
+            before = self.counters['implicit_wait_miss_seconds'] + self.counters['zero_wait_misses'] * IMPLICIT_WAIT_SECONDS
+            lines.append(f"  Optional lookups missed at zero wait: {self.counters['zero_wait_misses']}, implicit wait lost "
+                         f"{self.counters['implicit_wait_miss_seconds']:.1f}s instead of about {before:.1f}s")
+        if self.counters['llm_requests']:
+            lines.append(f"  LLM calls: {self.counters['llm_requests']}, {self.counters['llm_prompt_tokens']} prompt tokens, "
+                         f"{self.counters['llm_completion_tokens']} completion tokens")
+        return "\n".join(lines)
+
+    def close(self):
+        """Write the closing summary event and the trace file."""
+        self.event('summary', stages=self.stages, counters=dict(self.counters))
+        if self.trace_path:
+            with self._lock:
+                trace = {'traceEvents': self._trace_events, 'displayTimeUnit': 'ms'}
+            with open(self.trace_path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f, default=str)
+            print(f"Wrote {len(trace['traceEvents'])} trace events to {self.trace_path}")
+        if self._events is not None:
+            self._events.close()
+            self._events = None
+
+# Implicit wait set on the driver in init_browser, in seconds. Required lookups rely on it to ride out short renders.
+IMPLICIT_WAIT_SECONDS = 1
+
+class ElementLookup:
+    """
+    Presence tests for elements that may or may not be on the page.
+
+    With an implicit wait set on the driver, looking up an absent element costs the whole wait. Optional
+    elements are looked up with find_elements while the implicit wait is switched off, so a miss returns
+    at once; where an element may still be rendering, the caller waits for it explicitly with the Waiter.
+    Each miss is counted, so the summary can show the implicit waits they would have cost.
+    """
+    def __init__(self, driver, implicit_wait=IMPLICIT_WAIT_SECONDS, metrics=None):
+        self.browser = driver
+        self.implicit_wait = implicit_wait
+        self.metrics = metrics
+        self._depth = 0
+
+    @contextmanager
+    def no_implicit_wait(self):
+        """Switch the implicit wait off for the enclosed block. Nested blocks switch it only once."""
+        if self._depth == 0:
+            self.browser.implicitly_wait(0)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.browser.implicitly_wait(self.implicit_wait)
+
+    def all(self, by, value, root=None):
+        """Return every matching element under root (the whole page by default), or an empty list at once."""
+        with self.no_implicit_wait():
+            elements = (root or self.browser).find_elements(by, value)
+        if not elements and self.metrics:
+            self.metrics.count('zero_wait_misses')
+        return elements
+
+    def optional(self, by, value, root=None):
+        """Return the first matching element under root, or None at once."""
+        elements = self.all(by, value, root)
+        return elements[0] if elements else None
+
+    def click_optional(self, by, value, root=None):
+        """Click the element if it is there and return whether it was."""
+        element = self.optional(by, value, root)
+        if element is None:
+            return False
+        element.click()
+        return True
+
+class Waiter:
+    """
+    Central place for every pause the bot makes.
+
+    Readiness waits poll a page condition with WebDriverWait and return as soon as it holds. Pacing
+    waits are deliberate, human-like delays with a configurable jitter floor and scale. Time spent in
+    each named wait is recorded separately for the two kinds.
+    """
+    def __init__(self, driver, timeout=10, pacing_floor=0.5, pacing_scale=1.0, dry_run=False, lookups=None):
+        self.browser = driver
+        self.timeout = timeout
+        # Readiness conditions are polled with the implicit wait off, so each poll of an absent element is instant
+        self.lookups = lookups
+        self.pacing_floor = pacing_floor
+        self.pacing_scale = pacing_scale
+        # In a dry run pacing is recorded but not slept, for driving the bot against a stub browser
+        self.dry_run = dry_run
+        self.stats = {}
+
+    def _record(self, name, kind, seconds, timed_out=False):
+        stat = self.stats.setdefault((kind, name), {'count': 0, 'seconds': 0.0, 'timeouts': 0})
+        stat['count'] += 1
+        stat['seconds'] += seconds
+        stat['timeouts'] += int(timed_out)
+
+    def until(self, name, condition, timeout=None):
+        """Wait until condition(driver) is truthy and return its value, or None on timeout."""
+        start = time.monotonic()
+        try:
+            with self.lookups.no_implicit_wait() if self.lookups else nullcontext():
+                result = WebDriverWait(self.browser, timeout or self.timeout, poll_frequency=0.2).until(condition)
+        except TimeoutException:
+            print(f"Timed out waiting for {name}")
+            self._record(name, 'readiness', time.monotonic() - start, timed_out=True)
+            return None
+        self._record(name, 'readiness', time.monotonic() - start)
+        return result
+
+    def pace(self, name, low, high):
+        """Sleep for a human-like, jittered delay between low and high seconds, never below the jitter floor."""
+        self.sleep(name, max(self.pacing_floor, random.uniform(low, high) * self.pacing_scale))
+
+    def sleep(self, name, seconds):
+        """Sleep for exactly the given time, recorded as pacing."""
+        if not self.dry_run:
+            time.sleep(seconds)
+        self._record(name, 'pacing', seconds)
+
+    def totals(self):
+        return {kind: sum(stat['seconds'] for (k, _), stat in self.stats.items() if k == kind) for kind in ('readiness', 'pacing')}
+
+    def summary(self):
+        lines = ["Wait times (kind, name, count, seconds, timeouts):"]
+        for (kind, name), stat in sorted(self.stats.items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"  {kind:<9} {name:<28} {stat['count']:>6} {stat['seconds']:>10.1f} {stat['timeouts']:>6}")
+        totals = self.totals()
+        lines.append(f"  Total: {totals['readiness']:.1f}s waiting for pages, {totals['pacing']:.1f}s of deliberate pacing")
+        return "\n".join(lines)
+
+class DailyLimitReachedError(Exception):
+    """Raised when LinkedIn shows its daily Easy Apply limit instead of the application modal."""
+
+
+class TokenBucket:
+    """Holds up to capacity tokens, refilled continuously at rate tokens per second."""
+    def __init__(self, capacity, rate, tokens=None):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity if tokens is None else max(0.0, min(capacity, tokens))
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self):
+        """Seconds until a whole token is available."""
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self._refill()
+        self.tokens = max(0.0, self.tokens - 1)
+
+class PacingGovernor:
+    """
+    Paces applications with two token buckets, one refilled over an hour and one over a day, and
+    results pages with a third, refilled over an hour.
+
+    Each application takes a token from both application buckets, and each results page one from the
+    page bucket. Before either the governor sleeps until the buckets hold a token, plus a random pause
+    drawn from an exponential distribution, so the time between them varies like a person's would.
+    Pages are paced whether or not they have jobs to apply to, so paging through empty or already
+    handled results stays as slow as browsing them. The application buckets start from the
+    applications in the ledger for the last hour and day, so restarting the bot does not reset them.
+
+    Once the day's budget is spent, or LinkedIn shows its daily Easy Apply limit, the bot stops
+    submitting: with the 'stop' action the run ends, with 'discover' it keeps paging through searches
+    and records the jobs it finds, without opening them or asking the AI about them.
+    """
+    DAILY_LIMIT_ACTIONS = ('stop', 'discover')
+
+    def __init__(self, waiter, metrics, per_hour=15, per_day=100, burst=3, pages_per_hour=20, page_burst=5,
+                 jitter_seconds=30, daily_limit_action='discover', applied_last_hour=0, applied_last_day=0):
+        if daily_limit_action not in self.DAILY_LIMIT_ACTIONS:
+            raise ValueError(f"dailyLimitAction must be one of {', '.join(self.DAILY_LIMIT_ACTIONS)}")
+        self.waiter = waiter
+        self.metrics = metrics
+        self.jitter_seconds = jitter_seconds
+        self.daily_limit_action = daily_limit_action
+        self.hour_bucket = TokenBucket(burst, per_hour / 3600, burst - applied_last_hour)
+        self.day_bucket = TokenBucket(per_day, per_day / 86400, per_day - applied_last_day)
+        self.page_bucket = TokenBucket(page_burst, pages_per_hour / 3600)
+        self.limit_reason = None
+
+    @property
+    def submitting(self):
+        return self.limit_reason is None
+
+    @property
+    def stopped(self):
+        """True once the run should end instead of carrying on in discovery mode."""
+        return not self.submitting and self.daily_limit_action == 'stop'
+
+    def jitter(self):
+        """A random pause with the configured mean, capped at three times the mean."""
+        if self.jitter_seconds <= 0:
+            return 0.0
+        return min(random.expovariate(1 / self.jitter_seconds), 3 * self.jitter_seconds)
+
+    def wait_for_turn(self):
+        """Sleep until the next application may go out. Returns False if no more applications go out today."""
+        if not self.submitting:
+            return False
+        # The day bucket only refills a token every few minutes; waiting for it is waiting for tomorrow
+        if self.day_bucket.wait_time() > 0:
+            self.limit_reached('daily budget spent')
+            return False
+        self._wait(self.hour_bucket, 'application')
+        return True
+
+    def wait_for_page(self):
+        """Sleep until the next results page may be loaded, and take its token."""
+        self._wait(self.page_bucket, 'page')
+        self.page_bucket.take()
+        self.metrics.count('paced_pages')
+
+    def _wait(self, bucket, kind):
+        wait = bucket.wait_time()
+        if wait <= 0:
+            self.metrics.count('pacing_immediate')
+            return
+        jitter = self.jitter()
+        self.metrics.count('pacing_waits')
+        self.metrics.count(f'pacing_{kind}_waits')
+        self.metrics.count('pacing_wait_seconds', wait)
+        self.metrics.count('pacing_jitter_seconds', jitter)
+        self.metrics.event('pacing', decision='wait', paced=kind, seconds=round(wait, 1), jitter=round(jitter, 1),
+                           tokens=round(bucket.tokens, 2), day_tokens=round(self.day_bucket.tokens, 2))
+        print(f"Pacing: waiting {(wait + jitter) / 60:.1f} minutes before the next {kind}.")
+        self.waiter.sleep(f"pacing governor ({kind})", wait + jitter)
+
+    def record_application(self):
+        self.hour_bucket.take()
+        self.day_bucket.take()
+        self.metrics.count('paced_applications')
+        self.metrics.event('pacing', decision='applied', hour_tokens=round(self.hour_bucket.tokens, 2),
+                           day_tokens=round(self.day_bucket.tokens, 2))
+
+    def limit_reached(self, reason):
+        """Stop submitting for the rest of the run."""
+        if not self.submitting:
+            return
+        self.limit_reason = reason
+        self.metrics.count('pacing_limit_reached')
+        self.metrics.event('pacing', decision=self.daily_limit_action, reason=reason)
+        if self.daily_limit_action == 'stop':
+            print(f"Stopping the run: {reason}.")
+        else:
+            print(f"No more applications today ({reason}); only discovering jobs for the rest of the run.")
+
+    def summary(self):
+        counters = self.metrics.counters
+        line = (f"Pacing: {counters['paced_applications']} applications and {counters['paced_pages']} results pages, "
+                f"waited {counters['pacing_waits']} times for "
+                f"{(counters['pacing_wait_seconds'] + counters['pacing_jitter_seconds']) / 60:.1f} minutes "
+                f"({counters['pacing_jitter_seconds'] / 60:.1f} of them jitter), {self.day_bucket.tokens:.0f} left today")
+        if self.limit_reason:
+            line += f"; stopped submitting: {self.limit_reason}, {counters['jobs_discovered']} jobs discovered after that"
+        return line
+
+def page_loaded(driver):
+    return driver.execute_script("return document.readyState") == 'complete'
+
+def job_details_loaded(job_id):
+    """Condition for the job details pane showing the given job."""
+    def condition(driver):
+        return driver.execute_script(JOB_DETAILS_LOADED_SCRIPT, str(job_id))
+    return condition
+
+# Easy Apply forms have a handful of steps; a modal still open after this many is stuck on one of them
+MAX_MODAL_STEPS = 15
+
+def modal_step_marker(driver):
+    return driver.execute_script(MODAL_STEP_MARKER_SCRIPT)
+
+def modal_step_advanced(previous_marker):
+    """Condition for the Easy Apply modal moving on from the step identified by previous_marker."""
+    def condition(driver):
+        return modal_step_marker(driver) != previous_marker
+    return condition
+
+def element_present(by, value):
+    def condition(driver):
+        return driver.find_elements(by, value)
+    return condition
+
+def element_absent(by, value):
+    def condition(driver):
+        return not driver.find_elements(by, value)
+    return condition
+
+JOB_DETAILS_LOADED_SCRIPT = """
+const details = document.getElementById('job-details');
+if (!details || !details.innerText.trim()) return false;
+return window.location.href.includes(arguments[0]) ||
+    !!document.querySelector('.jobs-details a[href*="/jobs/view/' + arguments[0] + '"]');
+"""
+
+# Identifies the current Easy Apply step by its progress, heading, primary button and number of inline errors
+MODAL_STEP_MARKER_SCRIPT = """
+const modal = document.querySelector('.jobs-easy-apply-modal');
+if (!modal) return 'closed';
+const progress = modal.querySelector('progress, [role="progressbar"]');
+const heading = modal.querySelector('h3');
+const button = modal.querySelector('.artdeco-button--primary');
+return [
+    progress ? (progress.value || progress.getAttribute('aria-valuenow')) : '',
+    heading ? heading.innerText : '',
+    button ? button.innerText : '',
+    modal.querySelectorAll('.artdeco-inline-feedback--error').length
+].join('|');
+"""
+
+# Copies the search page, the job details pane or the Easy Apply modal (arguments[0] is 'page', 'details' or
+# 'modal') without scripts, frames, external stylesheets and images, so it can be replayed offline
+CAPTURE_FIXTURE_SCRIPT = """
+const kind = arguments[0];
+let element = null;
+if (kind === 'page') {
+    element = document.documentElement;
+} else if (kind === 'details') {
+    const details = document.getElementById('job-details');
+    element = details && (details.closest('.scaffold-layout__detail, .jobs-search__job-details--container, .jobs-details') || details.parentElement);
+} else {
+    const modal = document.querySelector('.jobs-easy-apply-modal');
+    element = modal && (modal.closest('.artdeco-modal-overlay') || modal);
+}
+if (!element) return null;
+const copy = element.cloneNode(true);
+copy.querySelectorAll('script, iframe, link[rel="stylesheet"], link[rel="preload"], link[rel="modulepreload"]')
+    .forEach(node => node.remove());
+copy.querySelectorAll('img').forEach(img => {
+    img.removeAttribute('src');
+    img.removeAttribute('srcset');
+});
+if (kind === 'page') return '<!DOCTYPE html>\\n' + copy.outerHTML;
+return kind === 'details' ? copy.innerHTML : copy.outerHTML;
+"""
+
+def fixture_slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-') or 'any'
+
+class FixtureRecorder:
+    """
+    Saves the pages the bot sees as HTML fixtures for the offline replay benchmark in benchmark.py.
+
+    Search result pages are stored per search and page number, job details panes per job ID and Easy Apply
+    modal steps per job ID and step. manifest.json lists the recorded searches. Fixtures hold whatever the
+    pages showed, including prefilled contact details, so keep them private.
+    """
+    def __init__(self, driver, directory):
+        self.browser = driver
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = {'searches': []}
+        if os.path.isfile(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+    @staticmethod
+    def search_page_path(position, location, page):
+        return os.path.join('search', f"{fixture_slug(position)}__{fixture_slug(location)}__{page}.html")
+
+    @staticmethod
+    def job_details_path(job_id):
+        return os.path.join('jobs', f"{job_id}.html")
+
+    @staticmethod
+    def modal_step_path(job_id, step):
+        return os.path.join('modal', str(job_id), f"{step}.html")
+
+    def _save(self, relative_path, kind):
+        try:
+            html = self.browser.execute_script(CAPTURE_FIXTURE_SCRIPT, kind)
+        except Exception:
+            print(f"Could not record the {kind} fixture {relative_path}")
+            return False
+        if not html:
+            return False
+        path = os.path.join(self.directory, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        return True
+
+    def record_search_page(self, position, location, page):
+        if self._save(self.search_page_path(position, location, page), 'page'):
+            search = {'position': position, 'location': location}
+            if search not in self.manifest['searches']:
+                self.manifest['searches'].append(search)
+                with open(self.manifest_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.manifest, f, indent=2)
+
+    def record_job_details(self, job_id):
+        self._save(self.job_details_path(job_id), 'details')
+
+    def record_modal_step(self, job_id, step):
+        self._save(self.modal_step_path(job_id, step), 'modal')
+
+# Reads everything the bot checks about the state of a page in one round-trip, instead of scanning the page source:
+# inline errors in the Easy Apply modal, the empty results banners, the results list header and checkpoint markers
+PAGE_STATE_SCRIPT = """
+const texts = (root, selector) => Array.from(root.querySelectorAll(selector), node => node.innerText.trim()).filter(Boolean);
+const modal = document.querySelector('.jobs-easy-apply-modal');
+const header = document.querySelector('.jobs-search-results-list__text');
+return {
+    url: window.location.href,
+    modal_open: !!modal,
+    modal_errors: modal ? texts(modal, '.artdeco-inline-feedback--error, [role="alert"]') : [],
+    empty_results: texts(document, '.jobs-search-two-pane__no-results-banner--expand, .jobs-search-no-results-banner, .artdeco-empty-state'),
+    results_header: header ? header.innerText.trim() : null,
+    checkpoint: window.location.pathname.includes('/checkpoint/') ||
+        !!document.querySelector('#captcha-internal, iframe[src*="captcha"], form[action*="checkpoint"]'),
+    headings: texts(document, 'h1, h2').slice(0, 5).concat([document.title]),
+    notices: texts(document, '.jobs-details-top-card__apply-error, .jobs-s-apply .artdeco-inline-feedback, ' +
+        '.artdeco-modal:not(.jobs-easy-apply-modal) .artdeco-modal__content, .artdeco-toast-item__message')
+};
+"""
+
+# Inline Easy Apply errors that mean a question was answered wrongly or a file is missing, per locale
+MODAL_ERROR_TABLE = {
+    'en': ['enter a valid', 'enter a decimal', 'enter a whole number', 'enter a whole number between 0 and 99',
+           'whole number', 'file is required', 'a file is required', 'make a selection', 'select checkbox to proceed',
+           'use the format'],
+    'es': ['introduce un número de whole entre', 'preguntas adicionales', 'cuántos años'],
+    'fr': ['saisissez un numéro', 'numéro de téléphone'],
+    'it': ['inserisci un numero whole compreso', 'inserisci'],
+    'nl': ['wholenummer', 'tussen'],
+    'pl': ['wpisz liczb', 'zakresu od'],
+    'pt': ['insira um um número'],
+    'zh': ['请输入whole编号', '请输入decimal编号', '长度超过 0.0', '请选择', '请 选 择']
+}
+MODAL_ERROR_PATTERNS = {
+    locale: re.compile('|'.join(re.escape(error) for error in sorted(errors, key=len, reverse=True)), re.IGNORECASE)
+    for locale, errors in MODAL_ERROR_TABLE.items()
+}
+EMPTY_RESULTS_TEXTS = ('no matching jobs found', 'unfortunately, things are')
+CHECKPOINT_TEXTS = ('security check', 'quick verification')
+# "You've reached the Easy Apply application limit for today. Save this job and come back tomorrow to continue applying."
+DAILY_LIMIT_TEXTS = ('easy apply application limit', 'come back tomorrow to continue applying')
+
+def probe_page_state(driver):
+    """Return the page state read by PAGE_STATE_SCRIPT."""
+    return driver.execute_script(PAGE_STATE_SCRIPT)
+
+def modal_error_matches(error_texts):
+    """Return (locale, error text) for every inline modal error found in MODAL_ERROR_TABLE."""
+    matches = []
+    for text in error_texts:
+        for locale, pattern in MODAL_ERROR_PATTERNS.items():
+            if pattern.search(text):
+                matches.append((locale, text))
+                break
+    return matches
+
+def shows_empty_results(page_state):
+    banner_text = ' '.join(page_state['empty_results']).lower()
+    return any(text in banner_text for text in EMPTY_RESULTS_TEXTS)
+
+def shows_checkpoint(page_state):
+    heading_text = ' '.join(page_state['headings']).lower()
+    return page_state['checkpoint'] or any(text in heading_text for text in CHECKPOINT_TEXTS)
+
+def shows_daily_limit(page_state):
+    notice_text = ' '.join(page_state['notices']).lower()
+    return any(text in notice_text for text in DAILY_LIMIT_TEXTS)
+
+# Ordered fallback chains of (By, value) candidates for each element the bot looks up on LinkedIn's pages
+SELECTOR_CHAINS = {
+    'results pane': [
+        (By.CSS_SELECTOR, '.scaffold-layout__list > div'),
+        (By.CSS_SELECTOR, '.jobs-search-results-list'),
+        (By.XPATH, '/html/body/div[6]/div[3]/div[4]/div/div/main/div/div[2]/div[1]/div'),
+        (By.XPATH, '/html/body/div[5]/div[3]/div[4]/div/div/main/div/div[2]/div[1]/div')
+    ],
+    'tile list': [
+        (By.CSS_SELECTOR, '.scaffold-layout__list ul'),
+        (By.CSS_SELECTOR, '.jobs-search-results-list ul'),
+        (By.XPATH, '/html/body/div[6]/div[3]/div[4]/div/div/main/div/div[2]/div[1]/div/ul'),
+        (By.XPATH, '/html/body/div[5]/div[3]/div[4]/div/div/main/div/div[2]/div[1]/div/ul')
+    ],
+    'title link': [
+        (By.CSS_SELECTOR, '.job-card-list__title--link'),
+        (By.CSS_SELECTOR, 'a.job-card-container__link'),
+        (By.CSS_SELECTOR, 'a[href*="/jobs/view/"]')
+    ],
+    'easy apply button': [
+        (By.CSS_SELECTOR, '.jobs-apply-button'),
+        (By.CSS_SELECTOR, 'button[aria-label*="Easy Apply"]'),
+        (By.XPATH, '//button[contains(., "Easy Apply")]')
+    ],
+    'modal': [
+        (By.CSS_SELECTOR, '.jobs-easy-apply-modal'),
+        (By.CSS_SELECTOR, '[role="dialog"][aria-labelledby*="easy-apply"]')
+    ],
+    'next button': [
+        (By.CSS_SELECTOR, '.jobs-easy-apply-modal .artdeco-button--primary'),
+        (By.CSS_SELECTOR, '.jobs-easy-apply-modal footer button:last-of-type'),
+        (By.CSS_SELECTOR, '.artdeco-button--primary')
+    ]
+}
+
+# Tries the candidates in arguments[1] in order under arguments[0] (or the document) and returns
+# [index, element] for the first one that matches, or null, in one round-trip without implicit waits
+FIND_FIRST_SCRIPT = """
+const root = arguments[0] || document;
+const candidates = arguments[1];
+for (let i = 0; i < candidates.length; i++) {
+    const [kind, value] = candidates[i];
+    let element = null;
+    if (kind === 'xpath') {
+        element = document.evaluate(value, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } else {
+        element = root.querySelector(value);
+    }
+    if (element) return [i, element];
+}
+return null;
+"""
+
+class SelectorRegistry:
+    """
+    Looks up elements by logical name through the fallback chains in SELECTOR_CHAINS.
+
+    All candidates of a chain are tried in one script call, so a missing candidate costs no implicit
+    wait. The registry counts which candidate matched and which were tried before it, and tries the
+    candidates with the best record first. The counts are kept in the selector_ranking table of the
+    ledger file, so the order carries over between runs and lookups hit on the first candidate.
+    """
+    SCRIPT_KINDS = {By.CSS_SELECTOR: 'css', By.XPATH: 'xpath'}
+
+    def __init__(self, driver, path, chains=None):
+        self.browser = driver
+        self.chains = chains or SELECTOR_CHAINS
+        self.stats = {}
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS selector_ranking (
+                target TEXT NOT NULL,
+                selector TEXT NOT NULL,
+                hits INTEGER NOT NULL,
+                misses INTEGER NOT NULL,
+                PRIMARY KEY (target, selector)
+            )
+        """)
+        self._connection.commit()
+        for target, selector, hits, misses in self._connection.execute("SELECT target, selector, hits, misses FROM selector_ranking"):
+            self.stats[(target, selector)] = {'hits': hits, 'misses': misses}
+
+    @staticmethod
+    def selector_key(candidate):
+        return f"{candidate[0]}={candidate[1]}"
+
+    def _stat(self, target, candidate):
+        return self.stats.setdefault((target, self.selector_key(candidate)), {'hits': 0, 'misses': 0})
+
+    def ranked(self, target):
+        """The candidates for target, best record first; ties keep the order of SELECTOR_CHAINS."""
+        chain = self.chains[target]
+        return sorted(chain, key=lambda candidate: -(self._stat(target, candidate)['hits'] - self._stat(target, candidate)['misses']))
+
+    def find_optional(self, target, root=None):
+        """Return the element for target, or None if no candidate matches."""
+        candidates = self.ranked(target)
+        script_candidates = [[self.SCRIPT_KINDS[by], value] for by, value in candidates]
+        result = self.browser.execute_script(FIND_FIRST_SCRIPT, root, script_candidates)
+        matched = result[0] if result else len(candidates)
+        for index, candidate in enumerate(candidates[:matched + 1]):
+            if index < matched:
+                self._stat(target, candidate)['misses'] += 1
+            elif result:
+                self._stat(target, candidate)['hits'] += 1
+        return result[1] if result else None
+
+    def find(self, target, root=None):
+        """Return the element for target, raising NoSuchElementException if no candidate matches."""
+        element = self.find_optional(target, root)
+        if element is None:
+            raise NoSuchElementException(f"No candidate selector matched the {target}")
+        return element
+
+    def save(self):
+        with self._connection:
+            self._connection.executemany("""
+                INSERT OR REPLACE INTO selector_ranking (target, selector, hits, misses) VALUES (?, ?, ?, ?)
+            """, [(target, selector, stat['hits'], stat['misses']) for (target, selector), stat in self.stats.items()])
+
+    def close(self):
+        self.save()
+        self._connection.close()
+
+    def summary(self):
+        lines = ["Selector hit rates (target, selector, hits, lookups):"]
+        for target in self.chains:
+            for candidate in self.ranked(target):
+                stat = self._stat(target, candidate)
+                lookups = stat['hits'] + stat['misses']
+                if lookups:
+                    lines.append(f"  {target:<18} {candidate[1][:60]:<60} {stat['hits']:>6} {lookups:>6} "
+                                 f"({100.0 * stat['hits'] / lookups:.0f}%)")
+        return "\n".join(lines)
+
+class PendingAIAnswer:
+    """A question left for the AI, answered in one batch per form step. resolve() turns the AI response into the field's answer."""
+    def __init__(self, question_text, response_type, options, resolve):
+        self.question_text = question_text
+        self.response_type = response_type
+        self.options = options
+        self.resolve = resolve
+
+# Scrolls the first job tile LinkedIn has not rendered yet (or the last tile) into view and waits for the results
+# list passed as arguments[0] to change. Resolves once the list has been quiet for arguments[1] ms after a change,
+# or after arguments[2] ms without one, with whether the number of tiles or rendered tiles changed.
+LOAD_JOB_TILES_SCRIPT = """
+const list = arguments[0], settleMs = arguments[1], timeoutMs = arguments[2], done = arguments[arguments.length - 1];
+const items = () => list.querySelectorAll('.scaffold-layout__list-item');
+const rendered = () => list.querySelectorAll('.scaffold-layout__list-item .job-card-list__title--link').length;
+const before = [items().length, rendered()];
+const target = Array.from(items()).find(item => !item.querySelector('.job-card-list__title--link')) || items()[items().length - 1];
+let settleTimer = null;
+const finish = () => {
+    observer.disconnect();
+    clearTimeout(giveUp);
+    clearTimeout(settleTimer);
+    done(items().length !== before[0] || rendered() !== before[1]);
+};
+const observer = new MutationObserver(() => {
+    clearTimeout(settleTimer);
+    settleTimer = setTimeout(finish, settleMs);
+});
+observer.observe(list, {childList: true, subtree: true});
+const giveUp = setTimeout(finish, timeoutMs);
+if (target) {
+    target.scrollIntoView({block: 'end'});
+} else {
+    finish();
+}
+"""
+# Quiet time that ends a batch of newly rendered tiles, and the longest wait for the list to change at all
+TILE_SETTLE_MS = 250
+TILE_LOAD_TIMEOUT_MS = 2000
+
+# Fetches the description of the job with ID arguments[0] from LinkedIn's public job posting fragment, without
+# clicking its tile, and resolves with its text, or null if it cannot be read within arguments[1] ms.
+FETCH_JOB_DESCRIPTION_SCRIPT = """
+const jobId = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+const giveUp = setTimeout(() => done(null), timeoutMs);
+fetch('/jobs-guest/jobs/api/jobPosting/' + jobId, {credentials: 'omit'})
+    .then(response => response.ok ? response.text() : null)
+    .then(html => {
+        clearTimeout(giveUp);
+        if (!html) return done(null);
+        const page = new DOMParser().parseFromString(html, 'text/html');
+        const description = page.querySelector('.show-more-less-html__markup, .description__text');
+        done(description ? description.textContent.trim() || null : null);
+    })
+    .catch(() => { clearTimeout(giveUp); done(null); });
+"""
+DESCRIPTION_FETCH_TIMEOUT_MS = 5000
+
+# Reads all job tiles in the results list passed as arguments[0] into plain records in one round-trip
+EXTRACT_JOB_TILES_SCRIPT = """
+const text = (root, selector) => {
+    const element = root.querySelector(selector);
+    return element ? element.innerText.trim() : '';
+};
+return Array.from(arguments[0].querySelectorAll('.scaffold-layout__list-item'), tile => {
+    const titleLink = tile.querySelector('.job-card-list__title--link');
+    const card = tile.querySelector('[data-job-id]');
+    let poster = '';
+    for (const span of tile.querySelectorAll('span')) {
+        const index = span.innerText.indexOf(' is hiring for this');
+        if (index !== -1) {
+            poster = span.innerText.slice(0, index);
+            break;
+        }
+    }
+    return {
+        id: tile.getAttribute('data-occludable-job-id') || (card ? card.getAttribute('data-job-id') : '') || '',
+        title: titleLink ? text(titleLink, 'strong') || titleLink.innerText.trim() : '',
+        link: titleLink ? titleLink.href.split('?')[0] : '',
+        company: text(tile, '.artdeco-entity-lockup__subtitle'),
+        poster: poster,
+        location: text(tile, '.job-card-container__metadata-item'),
+        apply_method: text(tile, '.job-card-container__apply-method'),
+        applied: /\\bapplied\\b/i.test(text(tile, '.job-card-container__footer-job-state')),
+        element: titleLink
+    };
+});
+"""
+
+# Serializes every question of the Easy Apply form passed as arguments[0] in one round-trip
+SNAPSHOT_FORM_SCRIPT = """
+const isRequired = field => field.required || field.getAttribute('aria-required') === 'true';
+return Array.from(arguments[0].querySelectorAll('.fb-dash-form-element'), (question, index) => {
+    const firstLabel = question.querySelector('label');
+    const snapshot = {
+        index: index,
+        kind: 'checkbox',
+        label: firstLabel ? firstLabel.innerText.trim() : '',
+        input_id: '',
+        input_type: '',
+        options: [],
+        required: false,
+        value: '',
+        element: firstLabel,
+        option_elements: []
+    };
+    const describe = (kind, field) => {
+        snapshot.kind = kind;
+        snapshot.element = field;
+        snapshot.input_id = field.id || '';
+        snapshot.input_type = (field.getAttribute('type') || field.tagName).toLowerCase();
+        snapshot.required = isRequired(field);
+        snapshot.value = field.value || '';
+    };
+
+    const fieldset = question.querySelector('fieldset');
+    const datepicker = question.querySelector('.artdeco-datepicker__input');
+    const select = question.querySelector('select');
+    const input = question.querySelector('input, textarea');
+    if (fieldset) {
+        const legend = fieldset.querySelector('.fb-dash-form-element__label span');
+        const labels = Array.from(fieldset.querySelectorAll('label'));
+        const inputs = Array.from(fieldset.querySelectorAll('input'));
+        const checked = inputs.findIndex(option => option.checked);
+        snapshot.kind = 'radio';
+        snapshot.label = legend ? legend.innerText.trim() : '';
+        snapshot.element = fieldset;
+        snapshot.options = labels.map(label => label.innerText.trim());
+        snapshot.option_elements = labels;
+        snapshot.required = inputs.some(isRequired) || fieldset.getAttribute('aria-required') === 'true';
+        snapshot.value = checked === -1 ? '' : (snapshot.options[checked] || '');
+    } else if (datepicker) {
+        describe('date', datepicker);
+    } else if (select) {
+        describe('select', select);
+        snapshot.options = Array.from(select.options, option => option.text.trim());
+        snapshot.value = select.selectedIndex >= 0 ? select.options[select.selectedIndex].text.trim() : '';
+    } else if (input) {
+        const type = (input.getAttribute('type') || input.tagName).toLowerCase();
+        if (input.id.toLowerCase().includes('numeric')) {
+            // For decimal and integer response fields, the id contains 'numeric' while the type remains 'text'
+            describe('numeric', input);
+        } else if (type.includes('text')) {
+            describe('text', input);
+        } else {
+            snapshot.input_id = input.id || '';
+            snapshot.input_type = type;
+            snapshot.required = isRequired(input);
+            snapshot.value = input.checked ? 'checked' : '';
+        }
+    }
+    return snapshot;
+});
+"""
+
+# Applies the answers passed as arguments[0] in one round-trip and returns the indexes of rejected fields.
+# Values are set through the native setters and followed by input/change events so React picks them up.
+BULK_FILL_SCRIPT = """
+const setNativeValue = (element, value) => {
+    const prototype = Object.getPrototypeOf(element);
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    element.dispatchEvent(new Event('blur', {bubbles: true}));
+};
+const control = label => label.control || (label.htmlFor ? document.getElementById(label.htmlFor) : label.querySelector('input'));
+const rejected = [];
+arguments[0].forEach((field, index) => {
+    try {
+        const element = field.element;
+        if (field.kind === 'text' || field.kind === 'numeric') {
+            setNativeValue(element, field.value);
+            if (element.value !== field.value) rejected.push(index);
+        } else if (field.kind === 'select') {
+            const option = Array.from(element.options).find(option => option.text.trim() === field.value);
+            if (!option) {
+                rejected.push(index);
+                return;
+            }
+            setNativeValue(element, option.value);
+            if (element.value !== option.value) rejected.push(index);
+        } else {
+            // Radio option and checkbox labels are clicked, which toggles their input the same way a user would
+            element.click();
+            const input = control(element);
+            if (!input || !input.checked) rejected.push(index);
+        }
+    } catch (error) {
+        rejected.push(index);
+    }
+});
+return rejected;
+"""
 
 class LinkedinEasyApply:
     def __init__(self, parameters, driver):
@@ -203,9 +2418,32 @@ class LinkedinEasyApply:
         self.locations = parameters.get('locations', [])
         self.residency = parameters.get('residentStatus', [])
         self.base_search_url = self.get_base_search_url(parameters)
-        self.seen_jobs = []
-        self.file_name = "output"
-        self.unprepared_questions_file_name = "unprepared_questions"
+        # Replaced by the local fixture server in benchmark.py
+        self.linkedin_url = (parameters.get('linkedinBaseUrl') or 'https://www.linkedin.com').rstrip('/')
+        self.seen_jobs = set()
+        self.chrome_profile = parameters.get('chromeProfile') or 'chrome_bot'
+        # (index, count) of the slice of the search plan this worker covers, set by the supervisor in main.py
+        self.search_shard = parameters.get('searchShard')
+        self.run_counts = Counter()
+        self.page_load_times = []
+        ledger_file = parameters.get('ledgerFile') or 'applications.db'
+        self.result_writer = ResultWriter(
+            ledger_file,
+            f"{ledger_file}-{os.path.basename(self.chrome_profile)}.journal",
+            flush_rows=parameters.get('resultFlushRows', 50),
+            flush_seconds=parameters.get('resultFlushSeconds', 30)
+        )
+        # Each worker has its own Chrome profile, so the profile name identifies the worker across restarts
+        self.ledger = ApplicationLedger(ledger_file, self.result_writer, worker_name=os.path.basename(self.chrome_profile))
+        self.selectors = SelectorRegistry(driver, ledger_file)
+        self.unprepared_questions = UnpreparedQuestionIndex(ledger_file, flush_seconds=parameters.get('resultFlushSeconds', 30))
+        self.last_unprepared_question = None
+        self.search_scheduler = SearchScheduler(
+            ledger_file,
+            min_yield=parameters.get('searchMinYield', 1),
+            unproductive_pages=parameters.get('searchUnproductivePages', 2),
+            revisit_hours=parameters.get('searchRevisitHours', 24)
+        )
         self.output_file_directory = parameters['outputFileDirectory']
         self.resume_dir = parameters['uploads']['resume']
         self.text_resume = parameters.get('textResume', '')
@@ -224,6 +2462,35 @@ class LinkedinEasyApply:
         self.experience_default = int(self.experience['default'])
         self.debug = parameters.get('debug', False)
         self.evaluate_job_fit = parameters.get('evaluateJobFit', True)
+        self.prefetch_job_fit = parameters.get('prefetchJobFit', False)
+        self.bulk_form_fill = parameters.get('bulkFormFill', True)
+        self.human_scroll_seconds = parameters.get('humanScrollSeconds', 2)
+        self.metrics = RunMetrics(events_path=parameters.get('metricsFile') or None,
+                                  trace_path=parameters.get('traceFile') or None)
+        self.metrics.instrument_driver(driver)
+        self.lookups = ElementLookup(driver, metrics=self.metrics)
+        self.fixture_recorder = FixtureRecorder(driver, parameters['recordFixtures']) if parameters.get('recordFixtures') else None
+        self.waiter = Waiter(
+            driver,
+            timeout=parameters.get('readinessTimeout', 10),
+            pacing_floor=parameters.get('pacingJitterFloor', 0.5),
+            pacing_scale=parameters.get('pacingScale', 1.0),
+            dry_run=parameters.get('dryRun', False),
+            lookups=self.lookups
+        )
+        self.governor = PacingGovernor(
+            self.waiter,
+            self.metrics,
+            per_hour=parameters.get('applicationsPerHour', 15),
+            per_day=parameters.get('applicationsPerDay', 100),
+            burst=parameters.get('applicationBurst', 3),
+            pages_per_hour=parameters.get('pagesPerHour', 20),
+            page_burst=parameters.get('pageBurst', 5),
+            jitter_seconds=parameters.get('pacingJitterSeconds', 30),
+            daily_limit_action=parameters.get('dailyLimitAction', 'discover'),
+            applied_last_hour=self.ledger.applied_since(datetime.now() - timedelta(hours=1)),
+            applied_last_day=self.ledger.applied_since(datetime.now() - timedelta(days=1))
+        )
         self.ai_response_generator = AIResponseGenerator(
             api_key=self.openai_api_key,
             personal_info=self.personal_info,
@@ -231,19 +2498,40 @@ class LinkedinEasyApply:
             languages=self.languages,
             resume_path=self.resume_dir,
             text_resume_path=self.text_resume,
-            debug=self.debug
+            debug=self.debug,
+            cache_path=parameters.get('aiCacheFile', 'ai_cache.db'),
+            cache_size=parameters.get('aiCacheSize', 5000),
+            job_fit_ttl_days=parameters.get('jobFitCacheDays', 30),
+            job_fit_workers=parameters.get('jobFitWorkers', 4),
+            resume_context_chars=parameters.get('resumeContextChars', 4000),
+            prefilter_settings={
+                'apply_score': parameters.get('prefilterApplyScore', 0.6),
+                'skip_score': parameters.get('prefilterSkipScore', 0.2),
+                'max_years_gap': parameters.get('prefilterMaxYearsGap', 2)
+            },
+            use_prefilter=parameters.get('prefilterJobFit', False),
+            llm_settings={
+                'base_url': parameters.get('llmBaseUrl'),
+                'model': parameters.get('llmModel', 'gpt-3.5-turbo'),
+                'timeout': parameters.get('llmTimeout', 20),
+                'max_retries': parameters.get('llmMaxRetries', 2),
+                'breaker_failures': parameters.get('llmBreakerFailures', 5),
+                'breaker_cooldown': parameters.get('llmBreakerCooldown', 120)
+            },
+            metrics=self.metrics
         )
 
     def login(self):
         try:
             # Check if the "chrome_bot" directory exists
             print("Attempting to restore previous session...")
-            if os.path.exists("chrome_bot"):
-                self.browser.get("https://www.linkedin.com/feed/")
-                time.sleep(random.uniform(5, 10))
+            if os.path.exists(self.chrome_profile):
+                self.browser.get(self.linkedin_url + "/feed/")
+                self.waiter.until("feed page load", page_loaded)
+                self.waiter.pace("after feed load", 2, 5)
 
                 # Check if the current URL is the feed page
-                if self.browser.current_url != "https://www.linkedin.com/feed/":
+                if self.browser.current_url != self.linkedin_url + "/feed/":
                     print("Feed page not loaded, proceeding to login.")
                     self.load_login_page_and_login()
             else:
@@ -256,15 +2544,13 @@ class LinkedinEasyApply:
             # raise Exception("Could not login!")
 
     def security_check(self):
-        current_url = self.browser.current_url
-        page_source = self.browser.page_source
-
-        if '/checkpoint/challenge/' in current_url or 'security check' in page_source or 'quick verification' in page_source:
+        if shows_checkpoint(probe_page_state(self.browser)):
             input("Please complete the security check and press enter on this console when it is done.")
-            time.sleep(random.uniform(5.5, 10.5))
+            self.waiter.until("page load after security check", page_loaded)
+            self.waiter.pace("after security check", 2, 5)
 
     def load_login_page_and_login(self):
-        self.browser.get("https://www.linkedin.com/login")
+        self.browser.get(self.linkedin_url + "/login")
 
         # Wait for the username field to be present
         WebDriverWait(self.browser, 10).until(
@@ -277,340 +2563,454 @@ class LinkedinEasyApply:
 
         # Wait for the feed page to load after login
         WebDriverWait(self.browser, 10).until(
-            EC.url_contains("https://www.linkedin.com/feed/")
+            EC.url_contains(self.linkedin_url + "/feed/")
         )
 
-        time.sleep(random.uniform(5, 10))
+        self.waiter.pace("after login", 2, 5)
 
     def start_applying(self):
         searches = list(product(self.positions, self.locations))
-        random.shuffle(searches)
-
-        page_sleep = 0
-        minimum_time = 60 * 2  # minimum time bot should run before taking a break
-        minimum_page_time = time.time() + minimum_time
+        if self.search_shard:
+            shard_index, shard_count = self.search_shard
+            searches = searches[shard_index::shard_count]
+        searches = self.search_scheduler.plan(searches)
 
         for (position, location) in searches:
+            if self.governor.stopped:
+                break
             location_url = "&location=" + location
             job_page_number = -1
 
             print("Starting the search for " + position + " in " + location + ".")
+            self.run_counts['searches'] += 1
+            page_yields = []
 
             try:
-                while True:
-                    page_sleep += 1
+                while self.search_scheduler.keep_paging(page_yields):
                     job_page_number += 1
+                    self.run_counts['pages'] += 1
+                    self.governor.wait_for_page()
                     print("Going to job page " + str(job_page_number))
-                    self.next_job_page(position, location_url, job_page_number)
-                    time.sleep(random.uniform(1.5, 3.5))
+                    with self.metrics.stage('search page load', page=job_page_number):
+                        self.next_job_page(position, location_url, job_page_number)
+                        self.waiter.until("search results load", element_present(By.CLASS_NAME, 'jobs-search-results-list__text'))
+                    if self.fixture_recorder:
+                        self.fixture_recorder.record_search_page(position, location, job_page_number)
+                    self.waiter.pace("after search results load", 1, 2)
                     print("Starting the application process for this page...")
-                    self.apply_jobs(location)
-                    print("Job applications on this page have been successfully completed.")
-
-                    time_left = minimum_page_time - time.time()
-                    if time_left > 0:
-                        print("Sleeping for " + str(time_left) + " seconds.")
-                        time.sleep(time_left)
-                        minimum_page_time = time.time() + minimum_time
-                    if page_sleep % 5 == 0:
-                        sleep_time = random.randint(180, 300)  # Changed from 500, 900 {seconds}
-                        print("Sleeping for " + str(sleep_time / 60) + " minutes.")
-                        time.sleep(sleep_time)
-                        page_sleep += 1
+                    applied_before = self.run_counts['applied']
+                    with self.metrics.stage('results page', position=position, location=location, page=job_page_number):
+                        eligible = self.apply_jobs(location)
+                    page_yields.append(eligible)
+                    self.search_scheduler.record_page(position, location, eligible, self.run_counts['applied'] - applied_before)
+                    print(f"Job applications on this page have been successfully completed ({eligible} new eligible jobs).")
+                    if self.governor.stopped:
+                        break
+                else:
+                    self.run_counts['searches_stopped_early'] += 1
+                    print(f"Stopping the search for {position} in {location}: the last "
+                          f"{self.search_scheduler.unproductive_pages} pages had too few new jobs.")
             except:
                 traceback.print_exc()
-                pass
-
-            time_left = minimum_page_time - time.time()
-            if time_left > 0:
-                print("Sleeping for " + str(time_left) + " seconds.")
-                time.sleep(time_left)
-                minimum_page_time = time.time() + minimum_time
-            if page_sleep % 5 == 0:
-                sleep_time = random.randint(500, 900)
-                print("Sleeping for " + str(sleep_time / 60) + " minutes.")
-                time.sleep(sleep_time)
-                page_sleep += 1
+                if not page_yields:
+                    # A search without any results still counts as an unproductive page
+                    self.search_scheduler.record_page(position, location, 0, 0)
+
+        print(self.waiter.summary())
+        print(self.governor.summary())
+        print(self.metrics.summary())
+        print(self.browser_summary())
+        if self.run_counts['duplicates_dropped']:
+            print(f"Dropped {self.run_counts['duplicates_dropped']} jobs seen before, avoiding {self.run_counts['clicks_avoided']} "
+                  f"clicks and {self.run_counts['llm_calls_avoided']} AI job fit evaluations")
+        token_usage = self.ai_response_generator.token_usage
+        if token_usage['requests']:
+            print(f"AI usage: {token_usage['requests']} requests, {token_usage['prompt_tokens']} prompt tokens, "
+                  f"{token_usage['completion_tokens']} completion tokens")
+        backend = self.ai_response_generator._client
+        if backend and (backend.stats['retries'] or backend.stats['failures'] or backend.stats['short_circuited']):
+            print(f"AI backend: {backend.stats['retries']} retries, {backend.stats['failures']} failed requests, "
+                  f"breaker opened {backend.stats['breaker_opened']} times, {backend.stats['short_circuited']} requests skipped")
+        if self.ai_response_generator.answer_cache:
+            print(self.ai_response_generator.answer_cache.stats())
+        if self.ai_response_generator.job_fit_cache:
+            print(self.ai_response_generator.job_fit_cache.stats())
+        self.result_writer.flush()
+        self.unprepared_questions.flush()
+        self.selectors.save()
+        print(self.selectors.summary())
+        self.metrics.event('run', **self.run_stats())
+        self.metrics.close()
 
     def apply_jobs(self, location):
-        no_jobs_text = ""
-        try:
-            no_jobs_element = self.browser.find_element(By.CLASS_NAME,
-                                                        'jobs-search-two-pane__no-results-banner--expand')
-            no_jobs_text = no_jobs_element.text
-        except:
-            pass
-        if 'No matching jobs found' in no_jobs_text:
-            raise Exception("No more jobs on this page.")
-
-        if 'unfortunately, things are' in self.browser.page_source.lower():
+        page_state = probe_page_state(self.browser)
+        if shows_empty_results(page_state):
             raise Exception("No more jobs on this page.")
 
-        job_results_header = ""
-        maybe_jobs_crap = ""
-        job_results_header = self.browser.find_element(By.CLASS_NAME, "jobs-search-results-list__text")
-        maybe_jobs_crap = job_results_header.text
+        if page_state['results_header'] is None:
+            raise Exception("No job results on this page.")
 
-        if 'Jobs you may be interested in' in maybe_jobs_crap:
+        if 'Jobs you may be interested in' in page_state['results_header']:
             raise Exception("Nothing to do here, moving forward...")
 
+        eligible = 0
         try:
-            # TODO: Can we simply use class name scaffold-layout__list for the scroll (necessary to show all li in the dom?)? Does it need to be the ul within the scaffold list?
-            #      Then we can simply get all the li scaffold-layout__list-item elements within it for the jobs
+            job_results = self.selectors.find('results pane')
+            job_list = self.selectors.find('tile list', root=job_results)
+            self.human_scroll(job_results, self.human_scroll_seconds)
+
+            # Jobs are handled batch by batch as the list renders them, instead of after the whole list has loaded.
+            # Reading the tiles is part of the iteration, so its errors are handled here as well.
+            for job_tiles in self.job_tile_batches(job_list):
+                candidates = self.filter_job_tiles(job_tiles, location)
+
+                job_fit_futures = {}
+                for index, (job_id, job_tile) in enumerate(candidates):
+                    if not self.governor.submitting:
+                        # Discovery only: the job stays 'seen' in the ledger and is opened on a later run
+                        self.metrics.count('jobs_discovered')
+                        continue
+                    if self.evaluate_job_fit and self.prefetch_job_fit:
+                        self.prefetch_job_fits(candidates[index:index + 1 + self.ai_response_generator.job_fit_workers],
+                                               job_fit_futures)
+                    self.process_job(job_id, job_tile, job_fit_futures.pop(job_id, None))
+                eligible += len(candidates)
+                if self.governor.stopped:
+                    break
 
-            # Define the XPaths for potentially different regions
-            xpath_region1 = "/html/body/div[6]/div[3]/div[4]/div/div/main/div/div[2]/div[1]/div"
-            xpath_region2 = "/html/body/div[5]/div[3]/div[4]/div/div/main/div/div[2]/div[1]/div"
-            job_list = []
+        except NoSuchElementException:
+            print("No job results found with any of the results pane or tile list selectors.")
 
-            # Attempt to locate the element using XPaths
-            try:
-                job_results = self.browser.find_element(By.XPATH, xpath_region1)
-                ul_xpath = "/html/body/div[6]/div[3]/div[4]/div/div/main/div/div[2]/div[1]/div/ul"
-                ul_element = self.browser.find_element(By.XPATH, ul_xpath)
-                ul_element_class = ul_element.get_attribute("class").split()[0]
-                print(f"Found using xpath_region1 and detected ul_element as {ul_element_class} based on {ul_xpath}")
+        except StaleElementReferenceException:
+            print("The results list was replaced while reading it, moving on with the jobs handled so far.")
 
-            except NoSuchElementException:
-                job_results = self.browser.find_element(By.XPATH, xpath_region2)
-                ul_xpath = "/html/body/div[5]/div[3]/div[4]/div/div/main/div/div[2]/div[1]/div/ul"
-                ul_element = self.browser.find_element(By.XPATH, ul_xpath)
-                ul_element_class = ul_element.get_attribute("class").split()[0]
-                print(f"Found using xpath_region2 and detected ul_element as {ul_element_class} based on {ul_xpath}")
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
 
-            # Extract the random class name dynamically
-            random_class = job_results.get_attribute("class").split()[0]
-            print(f"Random class detected: {random_class}")
+        return eligible
 
-            # Use the detected class name to find the element
-            job_results_by_class = self.browser.find_element(By.CSS_SELECTOR, f".{random_class}")
-            print(f"job_results: {job_results_by_class}")
-            print("Successfully located the element using the random class name.")
+    def job_tile_batches(self, job_list_element):
+        """
+        Yield the job tiles of the results list in batches, as soon as LinkedIn has rendered them.
 
-            # Scroll logic (currently disabled for testing)
-            self.scroll_slow(job_results_by_class)  # Scroll down
-            self.scroll_slow(job_results_by_class, step=300, reverse=True)  # Scroll up
+        The list only renders the tiles near the viewport. After the tiles rendered so far are handed out,
+        LOAD_JOB_TILES_SCRIPT brings the next unrendered tile into view and waits for the list to change,
+        until it stops changing.
+        """
+        handed_out = set()
+        finished = False
+        while True:
+            with self.metrics.stage('tile extraction'):
+                job_tiles = [job_tile for job_tile in self.extract_job_tiles(job_list_element)
+                             if job_tile['element'] is not None and (job_tile['id'] or job_tile['link']) not in handed_out]
+            if job_tiles:
+                handed_out.update(job_tile['id'] or job_tile['link'] for job_tile in job_tiles)
+                print(f"Found {len(job_tiles)} more jobs on this page")
+                yield job_tiles
+            if finished:
+                if not handed_out:
+                    print("No jobs found on this page")
+                return
+            try:
+                with self.metrics.stage('tile loading'):
+                    changed = self.browser.execute_async_script(LOAD_JOB_TILES_SCRIPT, job_list_element,
+                                                                TILE_SETTLE_MS, TILE_LOAD_TIMEOUT_MS)
+            except Exception as e:
+                print(f"Could not load more job tiles: {e}")
+                changed = False
+            # Take one more look after the list stops changing, for tiles rendered while it settled
+            finished = not changed
+
+    def filter_job_tiles(self, job_tiles, location):
+        """Drop tiles that were already handled, declined, already applied to or blacklisted, and return (job_id, tile) pairs for the rest."""
+        candidates = []
+        for job_tile in job_tiles:
+            job_title, company, poster, job_location, link = job_tile['title'], job_tile['company'], job_tile['poster'], job_tile['location'], job_tile['link']
+            job_id = get_job_id(job_tile['id']) or get_job_id(link)
+            if job_id is None:
+                continue
+            if compact_job_id(job_id) in self.seen_jobs or self.ledger.is_handled(job_id):
+                print(f"Skipping job {job_id} at {company}, it has already been handled.")
+                self.count_avoided_work(job_id)
+                continue
+            self.seen_jobs.add(compact_job_id(job_id))
 
-            # Find job list elements
-            job_list = self.browser.find_elements(By.CLASS_NAME, ul_element_class)[0].find_elements(By.CLASS_NAME, 'scaffold-layout__list-item')
-            print(f"Found {len(job_list)} jobs on this page")
+            # Declined jobs are only dropped while their verdict is valid; they are not counted as eligible either,
+            # so pages of them do not look productive to the SearchScheduler
+            if self.evaluate_job_fit and self.ai_response_generator.cached_job_fit(job_id, counted=False) is False:
+                print(f"Skipping job {job_id} at {company}, it was declined by an earlier job fit evaluation.")
+                self.run_counts['declined_dropped'] += 1
+                continue
 
-            if len(job_list) == 0:
-                raise Exception("No more jobs on this page.")  # TODO: Seemed to encounter an error where we ran out of jobs and didn't go to next page, perhaps because I didn't have scrolling on?
+            if job_tile['applied']:
+                print(f"An application for a job at {company} has been submitted earlier.")
+                self.record_job(job_id, 'applied_earlier', company, job_title, link, job_location, location)
+                continue
 
-        except NoSuchElementException:
-            print("No job results found using the specified XPaths or class.")
+            blacklist_reason = self.blacklist_reason(job_tile)
+            if blacklist_reason:
+                print(f"Job for {company} by {poster} is blacklisted: {blacklist_reason}.")
+                self.record_job(job_id, 'skipped', company, job_title, link, job_location, location)
+                continue
 
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+            if not self.ledger.claim(job_id, title=job_title, company=company, link=link, location=job_location,
+                                     search_location=location):
+                print(f"Skipping job {job_id} at {company}, another worker is handling it.")
+                continue
+            self.run_counts['seen'] += 1
+            candidates.append((job_id, job_tile))
+        return candidates
+
+    def count_avoided_work(self, job_id):
+        """Count the click, and the job fit evaluation if there is no cached verdict, saved by dropping a duplicate tile."""
+        self.run_counts['duplicates_dropped'] += 1
+        self.run_counts['clicks_avoided'] += 1
+        if self.evaluate_job_fit and self.ai_response_generator._client and self.ai_response_generator.cached_job_fit(job_id, counted=False) is None:
+            self.run_counts['llm_calls_avoided'] += 1
+
+    def prefetch_job_fits(self, upcoming, job_fit_futures):
+        """
+        Submit the job fit evaluations of the upcoming candidates to the background pool, so they run while
+        the jobs before them are applied to. Descriptions are fetched without clicking the tiles; a job whose
+        description cannot be fetched is evaluated when it is opened, as without prefetching.
+        """
+        for job_id, job_tile in upcoming:
+            if job_id in job_fit_futures or self.ai_response_generator.cached_job_fit(job_id, counted=False) is not None:
+                continue
+            try:
+                with self.metrics.stage('description fetch'):
+                    job_description = self.browser.execute_async_script(FETCH_JOB_DESCRIPTION_SCRIPT, str(job_id),
+                                                                        DESCRIPTION_FETCH_TIMEOUT_MS)
+            except Exception:
+                job_description = None
+            if not job_description:
+                self.metrics.count('description_fetch_failures')
+                # Marked so the fetch is not tried again for this job
+                job_fit_futures[job_id] = None
+                continue
+            job_fit_futures[job_id] = self.ai_response_generator.submit_job_fit(job_tile['title'], job_description, job_id)
 
-        for job_tile in job_list:
-            job_title, company, poster, job_location, apply_method, link = "", "", "", "", "", ""
+    def open_job(self, job_id, job_tile):
+        # LinkedIn opens the first job of a results page by itself; its details pane is reused as it is
+        if job_details_loaded(job_id)(self.browser):
+            if self.fixture_recorder:
+                self.fixture_recorder.record_job_details(job_id)
+            return
 
+        # Click the job to load description
+        max_retries = 3
+        retries = 0
+        job_el = job_tile['element']
+        while retries < max_retries:
             try:
-                ## patch to incorporate new 'verification' crap by LinkedIn
-                # job_title = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title').text # original code
-                job_title_element = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title--link')
-                job_title = job_title_element.find_element(By.TAG_NAME, 'strong').text
+                # TODO: This is throwing an exception when running out of jobs on a page
+                job_el.click()
+                break
+            except StaleElementReferenceException:
+                # The list re-rendered, look the tile up again by its job ID
+                retries += 1
+                job_el = self.selectors.find('title link', root=self.browser.find_element(
+                    By.CSS_SELECTOR, f'[data-occludable-job-id="{job_id}"]'))
+                continue
 
-                link = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title--link').get_attribute('href').split('?')[0]
-            except:
-                pass
-            try:
-                # company = job_tile.find_element(By.CLASS_NAME, 'job-card-container__primary-description').text # original code
-                company = job_tile.find_element(By.CLASS_NAME, 'artdeco-entity-lockup__subtitle').text
-            except:
-                pass
-            try:
-                # get the name of the person who posted for the position, if any is listed
-                hiring_line = job_tile.find_element(By.XPATH, '//span[contains(.,\' is hiring for this\')]')
-                hiring_line_text = hiring_line.text
-                name_terminating_index = hiring_line_text.find(' is hiring for this')
-                if name_terminating_index != -1:
-                    poster = hiring_line_text[:name_terminating_index]
-            except:
-                pass
-            try:
-                job_location = job_tile.find_element(By.CLASS_NAME, 'job-card-container__metadata-item').text
-            except:
-                pass
-            try:
-                apply_method = job_tile.find_element(By.CLASS_NAME, 'job-card-container__apply-method').text
-            except:
-                pass
+        with self.metrics.stage('job details load'):
+            self.waiter.until("job details load", job_details_loaded(job_id))
+        if self.fixture_recorder:
+            self.fixture_recorder.record_job_details(job_id)
+        self.waiter.pace("after job click", 0.5, 1.5)
+
+    def process_job(self, job_id, job_tile, job_fit_future=None):
+        """Evaluate and apply to a single job. job_fit_future is its evaluation if prefetch_job_fits submitted one."""
+        job_title, company, link = job_tile['title'], job_tile['company'], job_tile['link']
+
+        job_fit = None
+        description_read = False
+        if self.evaluate_job_fit:
+            job_fit = self.ai_response_generator.cached_job_fit(job_id)
+            if job_fit is False:
+                print("Skipping application: Job requirements not aligned with candidate profile per AI evaluation.")
+                self.record_job(job_id, 'declined')
+                return
 
-            contains_blacklisted_keywords = False
-            job_title_parsed = job_title.lower().split(' ')
+        try:
+            self.open_job(job_id, job_tile)
 
-            for word in self.title_blacklist:
-                if word.lower() in job_title_parsed:
-                    contains_blacklisted_keywords = True
-                    break
+            # Checked before evaluating job fit, so no AI calls are spent once LinkedIn refuses applications
+            if shows_daily_limit(probe_page_state(self.browser)):
+                self.governor.limit_reached("LinkedIn's daily Easy Apply limit")
+                self.metrics.count('jobs_discovered')
+                return
 
-            if company.lower() not in [word.lower() for word in self.company_blacklist] and \
-                    poster.lower() not in [word.lower() for word in self.poster_blacklist] and \
-                    contains_blacklisted_keywords is False and link not in self.seen_jobs:
+            if self.evaluate_job_fit and job_fit is None:
                 try:
-                    # Click the job to load description
-                    max_retries = 3
-                    retries = 0
-                    while retries < max_retries:
-                        try:
-                            # TODO: This is throwing an exception when running out of jobs on a page
-                            job_el = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title--link')
-                            job_el.click()
-                            break
-                        except StaleElementReferenceException:
-                            retries += 1
-                            continue
-
-                    time.sleep(random.uniform(3, 5))
-
-                    # TODO: Check if the job is already applied or the application has been reached
-                    # "You’ve reached the Easy Apply application limit for today. Save this job and come back tomorrow to continue applying."
-                    # Do this before evaluating job fit to save on API calls
-
-                    if self.evaluate_job_fit:
-                        try:
-                            # Get job description
+                    if job_fit_future is None:
+                        # Get job description
+                        with self.metrics.stage('description read'):
                             job_description = self.browser.find_element(
                                 By.ID, 'job-details'
-                            ).text  
+                            ).text
+                        if self.prefetch_job_fit:
+                            job_fit_future = self.ai_response_generator.submit_job_fit(job_title, job_description, job_id)
+
+                    # Evaluate if we should apply
+                    if job_fit_future is not None:
+                        # A prefetched evaluation has usually finished by now; any that has not runs on while the
+                        # open description is scrolled through, so the reading pause hides the AI's latency
+                        self.read_job_description()
+                        description_read = True
+                        with self.metrics.stage('fit evaluation wait'):
+                            should_apply = job_fit_future.result()
+                    else:
+                        with self.metrics.stage('fit evaluation'):
+                            should_apply = self.ai_response_generator.evaluate_job_fit(job_title, job_description, job_id)
+                    self.record_job(job_id, 'evaluated')
+                    if not should_apply:
+                        print("Skipping application: Job requirements not aligned with candidate profile per AI evaluation.")
+                        self.record_job(job_id, 'declined')
+                        return
+                except:
+                    print("Could not load job description")
 
-                            # Evaluate if we should apply
-                            if not self.ai_response_generator.evaluate_job_fit(job_title, job_description):
-                                print("Skipping application: Job requirements not aligned with candidate profile per AI evaluation.")
-                                continue
-                        except:
-                            print("Could not load job description")
+            # Jobs skipped above do not wait for a turn
+            if not self.governor.wait_for_turn():
+                self.metrics.count('jobs_discovered')
+                return
 
-                    try:
-                        done_applying = self.apply_to_job()
-                        if done_applying:
-                            print(f"Application sent to {company} for the position of {job_title}.")
-                        else:
-                            print(f"An application for a job at {company} has been submitted earlier.")
-                    except:
-                        temp = self.file_name
-                        self.file_name = "failed"
-                        print("Failed to apply to job. Please submit a bug report with this link: " + link)
-                        try:
-                            self.write_to_file(company, job_title, link, job_location, location)
-                        except:
-                            pass
-                        self.file_name = temp
-                        print(f'updated {temp}.')
+            try:
+                with self.metrics.stage('application', job_id=job_id):
+                    done_applying = self.apply_to_job(job_id, description_read)
+                if done_applying:
+                    print(f"Application sent to {company} for the position of {job_title}.")
+                    self.record_job(job_id, 'applied')
+                    self.governor.record_application()
+                else:
+                    print(f"An application for a job at {company} has been submitted earlier.")
+                    self.record_job(job_id, 'skipped')
+            except DailyLimitReachedError:
+                # The job stays 'seen' and is applied to on a later run
+                self.governor.limit_reached("LinkedIn's daily Easy Apply limit")
+                self.metrics.count('jobs_discovered')
+            except:
+                print("Failed to apply to job. Please submit a bug report with this link: " + link)
+                self.record_job(job_id, 'failed')
+        except:
+            traceback.print_exc()
+            print(f"Could not apply to the job in {company}")
+            pass
 
-                    try:
-                        self.write_to_file(company, job_title, link, job_location, location)
-                    except Exception:
-                        print(
-                            f"Unable to save the job information in the file. The job title {job_title} or company {company} cannot contain special characters,")
-                        traceback.print_exc()
-                except:
-                    traceback.print_exc()
-                    print(f"Could not apply to the job in {company}")
-                    pass
-            else:
-                print(f"Job for {company} by {poster} contains a blacklisted word {word}.")
+    def extract_job_tiles(self, job_list_element):
+        """
+        Read every job tile in the results list with a single script call.
+
+        Returns a list of plain dicts with the job id, title, link, company, poster, location, apply method,
+        whether the job is marked as applied, and the title link element used to open the job.
+        """
+        return self.browser.execute_script(EXTRACT_JOB_TILES_SCRIPT, job_list_element)
+
+    def blacklist_reason(self, job_tile):
+        job_title_parsed = job_tile['title'].lower().split(' ')
+        for word in self.title_blacklist:
+            if word.lower() in job_title_parsed:
+                return f"title contains {word}"
+
+        if job_tile['company'].lower() in [word.lower() for word in self.company_blacklist]:
+            return f"company {job_tile['company']}"
 
-            self.seen_jobs += link
+        if job_tile['poster'].lower() in [word.lower() for word in self.poster_blacklist]:
+            return f"poster {job_tile['poster']}"
 
-    def apply_to_job(self):
+        return None
+
+    def read_job_description(self):
+        """Scroll through the open job description like a person reading it."""
+        job_description_area = self.lookups.optional(By.ID, "job-details")
+        if job_description_area is not None:
+            try:
+                self.human_scroll(job_description_area, self.human_scroll_seconds)
+            except:
+                pass
+
+    def apply_to_job(self, job_id=None, description_read=False):
         easy_apply_button = None
 
         try:
-            easy_apply_button = self.browser.find_element(By.CLASS_NAME, 'jobs-apply-button')
+            easy_apply_button = self.selectors.find('easy apply button')
         except:
             return False
 
-        try:
-            job_description_area = self.browser.find_element(By.ID, "job-details")
-            print (f"{job_description_area}")
-            self.scroll_slow(job_description_area, end=1600)
-            self.scroll_slow(job_description_area, end=1600, step=400, reverse=True)
-        except:
-            pass
+        if not description_read:
+            self.read_job_description()
 
         print("Starting the job application...")
         easy_apply_button.click()
 
+        def modal_or_daily_limit(driver):
+            if self.selectors.find_optional('modal') is not None:
+                return 'modal'
+            return 'daily limit' if shows_daily_limit(probe_page_state(driver)) else None
+
+        if self.waiter.until("modal open", modal_or_daily_limit) == 'daily limit':
+            raise DailyLimitReachedError("LinkedIn shows the daily Easy Apply limit")
+
         button_text = ""
         submit_application_text = 'submit application'
+        step = 0
         while submit_application_text not in button_text.lower():
             try:
-                self.fill_up()
-                next_button = self.browser.find_element(By.CLASS_NAME, "artdeco-button--primary")
+                if step >= MAX_MODAL_STEPS:
+                    raise Exception(f"The application did not finish within {MAX_MODAL_STEPS} steps.")
+                if self.fixture_recorder and job_id:
+                    self.fixture_recorder.record_modal_step(job_id, step)
+                step += 1
+                with self.metrics.stage('modal step fill'):
+                    self.fill_up()
+                next_button = self.selectors.find('next button')
                 button_text = next_button.text.lower()
                 if submit_application_text in button_text:
                     try:
                         self.unfollow()
                     except:
                         print("Failed to unfollow company.")
-                time.sleep(random.uniform(1.5, 2.5))
-                next_button.click()
-                time.sleep(random.uniform(3.0, 5.0))
-
-                # Newer error handling
-                error_messages = [
-                    'enter a valid',
-                    'enter a decimal',
-                    'Enter a whole number'
-                    'Enter a whole number between 0 and 99',
-                    'file is required',
-                    'whole number',
-                    'make a selection',
-                    'select checkbox to proceed',
-                    'saisissez un numéro',
-                    '请输入whole编号',
-                    '请输入decimal编号',
-                    '长度超过 0.0',
-                    'Numéro de téléphone',
-                    'Introduce un número de whole entre',
-                    'Inserisci un numero whole compreso',
-                    'Preguntas adicionales',
-                    'Insira um um número',
-                    'Cuántos años'
-                    'use the format',
-                    'A file is required',
-                    '请选择',
-                    '请 选 择',
-                    'Inserisci',
-                    'wholenummer',
-                    'Wpisz liczb',
-                    'zakresu od',
-                    'tussen'
-                ]
-
-                if any(error in self.browser.page_source.lower() for error in error_messages):
+                self.waiter.pace("before next step", 1, 2)
+                step_marker = modal_step_marker(self.browser)
+                with self.metrics.stage('submit' if submit_application_text in button_text else 'modal step advance'):
+                    next_button.click()
+                    advanced = self.waiter.until("modal step advance", modal_step_advanced(step_marker))
+
+                page_state = probe_page_state(self.browser)
+                errors = modal_error_matches(page_state['modal_errors'])
+                if errors:
+                    print(f"Form errors: {', '.join(f'{text} ({locale})' for locale, text in errors)}")
                     raise Exception("Failed answering required questions or uploading required files.")
+                if page_state['modal_errors']:
+                    self.metrics.count('unrecognized_form_errors')
+                    print(f"Unrecognized form errors, add them to MODAL_ERROR_TABLE: {page_state['modal_errors']}")
+                    # Filling the same step again would only bring the same errors back
+                    if advanced is None:
+                        raise Exception("Form errors kept the application from moving on.")
             except:
                 traceback.print_exc()
                 self.browser.find_element(By.CLASS_NAME, 'artdeco-modal__dismiss').click()
-                time.sleep(random.uniform(3, 5))
+                self.waiter.until("discard dialog", element_present(By.CLASS_NAME, 'artdeco-modal__confirm-dialog-btn'))
+                self.waiter.pace("before discarding application", 0.5, 1.5)
                 self.browser.find_elements(By.CLASS_NAME, 'artdeco-modal__confirm-dialog-btn')[0].click()
-                time.sleep(random.uniform(3, 5))
+                self.waiter.until("modal close", element_absent(By.CLASS_NAME, 'jobs-easy-apply-modal'))
                 raise Exception("Failed to apply to job!")
 
         closed_notification = False
-        time.sleep(random.uniform(3, 5))
-        try:
-            self.browser.find_element(By.CLASS_NAME, 'artdeco-modal__dismiss').click()
-            closed_notification = True
-        except:
-            pass
-        try:
-            self.browser.find_element(By.CLASS_NAME, 'artdeco-toast-item__dismiss').click()
-            closed_notification = True
-        except:
-            pass
-        try:
-            self.browser.find_element(By.CSS_SELECTOR, 'button[data-control-name="save_application_btn"]').click()
-            closed_notification = True
-        except:
-            pass
+        self.waiter.until("application confirmation", element_present(
+            By.CSS_SELECTOR, '.artdeco-modal__dismiss, .artdeco-toast-item__dismiss, button[data-control-name="save_application_btn"]'))
+        self.waiter.pace("after submitting application", 1, 2)
+        # The wait above already saw at least one of these, so the others are only checked, not waited for
+        with self.lookups.no_implicit_wait():
+            for by, value in ((By.CLASS_NAME, 'artdeco-modal__dismiss'), (By.CLASS_NAME, 'artdeco-toast-item__dismiss'),
+                              (By.CSS_SELECTOR, 'button[data-control-name="save_application_btn"]')):
+                try:
+                    closed_notification = self.lookups.click_optional(by, value) or closed_notification
+                except:
+                    pass
 
-        time.sleep(random.uniform(3, 5))
+        self.waiter.pace("after closing confirmation", 1, 2)
 
         if closed_notification is False:
             raise Exception("Could not close the applied confirmation window!")
@@ -620,16 +3020,19 @@ class LinkedinEasyApply:
     def home_address(self, form):
         print("Trying to fill up home address fields")
         try:
-            groups = form.find_elements(By.CLASS_NAME, 'jobs-easy-apply-form-section__grouping')
+            groups = self.lookups.all(By.CLASS_NAME, 'jobs-easy-apply-form-section__grouping', root=form)
             if len(groups) > 0:
                 for group in groups:
-                    lb = group.find_element(By.TAG_NAME, 'label').text.lower()
-                    input_field = group.find_element(By.TAG_NAME, 'input')
+                    label = self.lookups.optional(By.TAG_NAME, 'label', root=group)
+                    input_field = self.lookups.optional(By.TAG_NAME, 'input', root=group)
+                    if label is None or input_field is None:
+                        continue
+                    lb = label.text.lower()
                     if 'street' in lb:
                         self.enter_text(input_field, self.personal_info['Street address'])
                     elif 'city' in lb:
                         self.enter_text(input_field, self.personal_info['City'])
-                        time.sleep(3)
+                        self.waiter.until("city suggestions", element_present(By.CSS_SELECTOR, '.basic-typeahead__selectable'), timeout=3)
                         input_field.send_keys(Keys.DOWN)
                         input_field.send_keys(Keys.RETURN)
                     elif 'zip' in lb or 'zip / postal code' in lb or 'postal' in lb:
@@ -647,483 +3050,446 @@ class LinkedinEasyApply:
         else:
             return 'no'
 
+    def snapshot_form(self, form):
+        """
+        Serialize every question in the form with a single script call.
+
+        Each question is a dict with its index, kind ('radio', 'text', 'numeric', 'date', 'select' or
+        'checkbox'), label text, input id and type, option texts, required flag and current value, plus the
+        element to fill and, for radio questions, the option label elements.
+        """
+        return self.browser.execute_script(SNAPSHOT_FORM_SCRIPT, form)
+
     def additional_questions(self, form):
         print("Trying to fill up additional questions")
 
-        questions = form.find_elements(By.CLASS_NAME, 'fb-dash-form-element')
+        questions = self.snapshot_form(form)
+        answers = []
+        unprepared = {}
         for question in questions:
+            self.last_unprepared_question = None
             try:
-                # Radio check
-                radio_fieldset = question.find_element(By.TAG_NAME, 'fieldset')
-                question_span = radio_fieldset.find_element(By.CLASS_NAME, 'fb-dash-form-element__label').find_elements(By.TAG_NAME, 'span')[0]
-                radio_text = question_span.text.lower()
-                print(f"Radio question text: {radio_text}")
-
-                radio_labels = radio_fieldset.find_elements(By.TAG_NAME, 'label')
-                radio_options = [(i, text.text.lower()) for i, text in enumerate(radio_labels)]
-                print(f"radio options: {[opt[1] for opt in radio_options]}")
-                
-                if len(radio_options) == 0:
-                    raise Exception("No radio options found in question")
-
-                answer = None
-
-                # Try to determine answer using existing logic
-                if 'driver\'s licence' in radio_text or 'driver\'s license' in radio_text:
-                    answer = self.get_answer('driversLicence')
-                elif any(keyword in radio_text.lower() for keyword in
-                         [
-                             'Aboriginal', 'native', 'indigenous', 'tribe', 'first nations',
-                             'native american', 'native hawaiian', 'inuit', 'metis', 'maori',
-                             'aborigine', 'ancestral', 'native peoples', 'original people',
-                             'first people', 'gender', 'race', 'disability', 'latino', 'torres',
-                             'do you identify'
-                         ]):
-                    negative_keywords = ['prefer', 'decline', 'don\'t', 'specified', 'none', 'no']
-                    answer = next((option for option in radio_options if
-                                   any(neg_keyword in option[1].lower() for neg_keyword in negative_keywords)), None)
-
-                elif 'assessment' in radio_text:
-                    answer = self.get_answer("assessment")
-
-                elif 'clearance' in radio_text:
-                    answer = self.get_answer("securityClearance")
-
-                elif 'north korea' in radio_text:
-                    answer = 'no'
-
-                elif 'previously employ' in radio_text or 'previous employ' in radio_text:
-                    answer = 'no'
-
-                elif 'authorized' in radio_text or 'authorised' in radio_text or 'legally' in radio_text:
-                    answer = self.get_answer('legallyAuthorized')
-
-                elif any(keyword in radio_text.lower() for keyword in
-                         ['certified', 'certificate', 'cpa', 'chartered accountant', 'qualification']):
-                    answer = self.get_answer('certifiedProfessional')
-
-                elif 'urgent' in radio_text:
-                    answer = self.get_answer('urgentFill')
-
-                elif 'commut' in radio_text or 'on-site' in radio_text or 'hybrid' in radio_text or 'onsite' in radio_text:
-                    answer = self.get_answer('commute')
-
-                elif 'remote' in radio_text:
-                    answer = self.get_answer('remote')
-
-                elif 'background check' in radio_text:
-                    answer = self.get_answer('backgroundCheck')
-
-                elif 'drug test' in radio_text:
-                    answer = self.get_answer('drugTest')
-
-                elif 'currently living' in radio_text or 'currently reside' in radio_text or 'right to live' in radio_text:
-                    answer = self.get_answer('residency')
-
-                elif 'level of education' in radio_text:
-                    for degree in self.checkboxes['degreeCompleted']:
-                        if degree.lower() in radio_text:
-                            answer = "yes"
-                            break
-
-                elif 'experience' in radio_text:
-                    if self.experience_default > 0:
-                        answer = 'yes'
-                    else:
-                        for experience in self.experience:
-                            if experience.lower() in radio_text:
-                                answer = "yes"
-                                break
-
-                elif 'data retention' in radio_text:
-                    answer = 'no'
-
-                elif 'sponsor' in radio_text:
-                    answer = self.get_answer('requireVisa')
-                
-                to_select = None
+                answer = self.decide_answer(question)
                 if answer is not None:
-                    print(f"Choosing answer: {answer}")
-                    i = 0
-                    for radio in radio_labels:
-                        if answer in radio.text.lower():
-                            to_select = radio_labels[i]
-                            break
-                        i += 1
-                    if to_select is None:
-                        print("Answer not found in radio options")
-
-                if to_select is None:
-                    print("No answer determined")
-                    self.record_unprepared_question("radio", radio_text)
-
-                    # Since no response can be determined, we use AI to identify the best responseif available, falling back to the final option if the AI response is not available
-                    ai_response = self.ai_response_generator.generate_response(
-                        question_text,
-                        response_type="choice",
-                        options=radio_options
-                    )
-                    if ai_response is not None:
-                        to_select = radio_labels[ai_response]
-                    else:
-                        to_select = radio_labels[len(radio_labels) - 1]
-                to_select.click()
-
-                if radio_labels:
-                    continue
+                    answers.append((question, answer))
             except Exception as e:
-                print("An exception occurred while filling up radio field")
-
-            # Questions check
+                print(f"An exception occurred while answering {question['kind']} field: {e}")
+            if self.last_unprepared_question:
+                unprepared[id(question)] = self.last_unprepared_question
+
+        answers = self.resolve_ai_answers(answers)
+        for question, answer in answers:
+            if id(question) in unprepared:
+                answer_text = question['options'][answer] if question['kind'] == 'radio' and isinstance(answer, int) else answer
+                self.unprepared_questions.add_details(unprepared[id(question)], question.get('options'), answer_text)
+        self.unprepared_questions.flush_if_due()
+        answers = [(question, answer) for question, answer in answers if self.needs_update(question, answer)]
+        if self.bulk_form_fill:
+            answers = self.bulk_fill(answers)
+
+        for question, answer in answers:
             try:
-                question_text = question.find_element(By.TAG_NAME, 'label').text.lower()
-                print( question_text )  # TODO: Put logging behind debug flag
+                self.apply_answer(question, answer)
+            except Exception as e:
+                self.metrics.count('form_field_errors')
+                print(f"An exception occurred while filling up {question['kind']} field: {e}")
 
-                txt_field_visible = False
-                try:
-                    txt_field = question.find_element(By.TAG_NAME, 'input')
-                    txt_field_visible = True
-                except:
-                    try:
-                        txt_field = question.find_element(By.TAG_NAME, 'textarea')  # TODO: Test textarea
-                        txt_field_visible = True
-                    except:
-                        raise Exception("Could not find textarea or input tag for question")
+    def bulk_fill(self, answers):
+        """
+        Write all answers with a single script call, dispatching the events LinkedIn's forms listen for.
 
-                if 'numeric' in txt_field.get_attribute('id').lower():
-                    # For decimal and integer response fields, the id contains 'numeric' while the type remains 'text' 
-                    text_field_type = 'numeric'
-                elif 'text' in txt_field.get_attribute('type').lower():
-                    text_field_type = 'text'
-                else:
-                    raise Exception("Could not determine input type of input field!")
+        Returns the answers the script could not apply, to be filled in one element at a time. Date pickers
+        need real key presses and are always returned.
+        """
+        fields = []
+        remaining = []
+        for question, answer in answers:
+            if question['kind'] == 'date':
+                remaining.append((question, answer))
+                continue
+            element = question['option_elements'][answer] if question['kind'] == 'radio' else question['element']
+            fields.append((question, answer, {'kind': question['kind'], 'element': element, 'value': str(answer)}))
 
-                to_enter = ''
-                if 'experience' in question_text or 'how many years in' in question_text:
-                    no_of_years = None
-                    for experience in self.experience:
-                        if experience.lower() in question_text:
-                            no_of_years = int(self.experience[experience])
-                            break
-                    if no_of_years is None:
-                        self.record_unprepared_question(text_field_type, question_text)
-                        no_of_years = int(self.experience_default)
-                    to_enter = no_of_years
+        if not fields:
+            return remaining
 
-                elif 'grade point average' in question_text:
-                    to_enter = self.university_gpa
+        try:
+            rejected = set(self.browser.execute_script(BULK_FILL_SCRIPT, [field for _, _, field in fields]))
+        except Exception as e:
+            print(f"Bulk form fill failed, filling fields one at a time: {e}")
+            rejected = set(range(len(fields)))
+
+        if rejected:
+            print(f"Bulk form fill rejected {len(rejected)} of {len(fields)} fields")
+        remaining += [(question, answer) for i, (question, answer, _) in enumerate(fields) if i in rejected]
+        return remaining
+
+    def needs_update(self, question, answer):
+        kind = question['kind']
+        if kind == 'radio':
+            return question['value'] != question['options'][answer]
+        elif kind in ('text', 'numeric', 'select'):
+            return question['value'] != str(answer)
+        return True
 
-                elif 'first name' in question_text:
-                    to_enter = self.personal_info['First Name']
+    def resolve_ai_answers(self, answers):
+        """Answer every question left to the AI on this step with one batched request."""
+        pending = [(i, answer) for i, (_, answer) in enumerate(answers) if isinstance(answer, PendingAIAnswer)]
+        if not pending:
+            return answers
+
+        ai_responses = self.ai_response_generator.generate_responses([
+            {'id': str(i), 'text': answer.question_text, 'response_type': answer.response_type, 'options': answer.options}
+            for i, answer in pending
+        ])
+        resolved = list(answers)
+        for i, answer in pending:
+            resolved[i] = (answers[i][0], answer.resolve(ai_responses.get(str(i))))
+        return resolved
+
+    def decide_answer(self, question):
+        """Return the answer for a snapshotted question, or None if the field should be left alone."""
+        kind = question['kind']
+        if kind == 'radio':
+            return self.decide_radio_answer(question)
+        elif kind in ('text', 'numeric'):
+            return self.decide_text_answer(question)
+        elif kind == 'date':
+            return date.today().strftime("%m/%d/%y")
+        elif kind == 'select':
+            return self.decide_dropdown_answer(question)
+        else:
+            # Checkbox for agreeing to terms and service
+            return question['value'] != 'checked' or None
+
+    def apply_answer(self, question, answer):
+        kind = question['kind']
+        if kind == 'radio':
+            question['option_elements'][answer].click()
+        elif kind in ('text', 'numeric'):
+            self.enter_text(question['element'], answer)
+        elif kind == 'date':
+            date_picker = question['element']
+            date_picker.clear()
+            date_picker.send_keys(answer)
+            self.waiter.until("date picker calendar", element_present(By.CLASS_NAME, 'artdeco-calendar'), timeout=3)
+            date_picker.send_keys(Keys.RETURN)
+        elif kind == 'select':
+            self.select_dropdown(question['element'], answer)
+        else:
+            question['element'].click()
 
-                elif 'last name' in question_text:
-                    to_enter = self.personal_info['Last Name']
+    def decide_radio_answer(self, question):
+        radio_text = question['label'].lower()
+        print(f"Radio question text: {radio_text}")
 
-                elif 'name' in question_text:
-                    to_enter = self.personal_info['First Name'] + " " + self.personal_info['Last Name']
+        radio_options = [(i, text.lower()) for i, text in enumerate(question['options'])]
+        print(f"radio options: {[opt[1] for opt in radio_options]}")
 
-                elif 'pronouns' in question_text:
-                    to_enter = self.personal_info['Pronouns']
+        if len(radio_options) == 0:
+            raise Exception("No radio options found in question")
 
-                elif 'phone' in question_text:
-                    to_enter = self.personal_info['Mobile Phone Number']
+        answer = None
 
-                elif 'linkedin' in question_text:
-                    to_enter = self.personal_info['Linkedin']
+        # Try to determine answer using existing logic
+        if 'driver\'s licence' in radio_text or 'driver\'s license' in radio_text:
+            answer = self.get_answer('driversLicence')
+        elif any(keyword in radio_text.lower() for keyword in
+                 [
+                     'Aboriginal', 'native', 'indigenous', 'tribe', 'first nations',
+                     'native american', 'native hawaiian', 'inuit', 'metis', 'maori',
+                     'aborigine', 'ancestral', 'native peoples', 'original people',
+                     'first people', 'gender', 'race', 'disability', 'latino', 'torres',
+                     'do you identify'
+                 ]):
+            negative_keywords = ['prefer', 'decline', 'don\'t', 'specified', 'none', 'no']
+            answer = next((option[1] for option in radio_options if
+                           any(neg_keyword in option[1].lower() for neg_keyword in negative_keywords)), None)
 
-                elif 'message to hiring' in question_text or 'cover letter' in question_text:
-                    to_enter = self.personal_info['MessageToManager']
+        elif 'assessment' in radio_text:
+            answer = self.get_answer("assessment")
 
-                elif 'website' in question_text or 'github' in question_text or 'portfolio' in question_text:
-                    to_enter = self.personal_info['Website']
+        elif 'clearance' in radio_text:
+            answer = self.get_answer("securityClearance")
 
-                elif 'notice' in question_text or 'weeks' in question_text:
-                    if text_field_type == 'numeric':
-                        to_enter = int(self.notice_period)
-                    else:
-                        to_enter = str(self.notice_period)
+        elif 'north korea' in radio_text:
+            answer = 'no'
 
-                elif 'salary' in question_text or 'expectation' in question_text or 'compensation' in question_text or 'CTC' in question_text:
-                    if text_field_type == 'numeric':
-                        to_enter = int(self.salary_minimum)
-                    else:
-                        to_enter = float(self.salary_minimum)
-                    self.record_unprepared_question(text_field_type, question_text)
-
-                # Since no response can be determined, we use AI to generate a response if available, falling back to 0 or empty string if the AI response is not available
-                if text_field_type == 'numeric':
-                    if not isinstance(to_enter, (int, float)):
-                        ai_response = self.ai_response_generator.generate_response(
-                            question_text,
-                            response_type="numeric"
-                        )
-                        to_enter = ai_response if ai_response is not None else 0
-                elif to_enter == '':
-                    ai_response = self.ai_response_generator.generate_response(
-                        question_text,
-                        response_type="text"
-                    )
-                    to_enter = ai_response if ai_response is not None else " ‏‏‎ "
-
-                self.enter_text(txt_field, to_enter)
-                continue
-            except:
-                print("An exception occurred while filling up text field")  # TODO: Put logging behind debug flag
+        elif 'previously employ' in radio_text or 'previous employ' in radio_text:
+            answer = 'no'
 
-            # Date Check
-            try:
-                date_picker = question.find_element(By.CLASS_NAME, 'artdeco-datepicker__input ')
-                date_picker.clear()
-                date_picker.send_keys(date.today().strftime("%m/%d/%y"))
-                time.sleep(3)
-                date_picker.send_keys(Keys.RETURN)
-                time.sleep(2)
-                continue
-            except:
-                print("An exception occurred while filling up date picker field")  # TODO: Put logging behind debug flag
+        elif 'authorized' in radio_text or 'authorised' in radio_text or 'legally' in radio_text:
+            answer = self.get_answer('legallyAuthorized')
 
-            # Dropdown check
-            try:
-                question_text = question.find_element(By.TAG_NAME, 'label').text.lower()
-                print(f"Dropdown question text: {question_text}")  # TODO: Put logging behind debug flag
-                dropdown_field = question.find_element(By.TAG_NAME, 'select')
-
-                select = Select(dropdown_field)
-                options = [options.text for options in select.options]
-                print(f"Dropdown options: {options}")  # TODO: Put logging behind debug flag
-
-                if 'proficiency' in question_text:
-                    proficiency = "None"
-                    for language in self.languages:
-                        if language.lower() in question_text:
-                            proficiency = self.languages[language]
-                            break
-                    self.select_dropdown(dropdown_field, proficiency)
-
-                elif 'clearance' in question_text:
-                    answer = self.get_answer('securityClearance')
-
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        self.record_unprepared_question(text_field_type, question_text)
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'assessment' in question_text:
-                    answer = self.get_answer('assessment')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    # if choice == "":
-                    #    choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'commut' in question_text or 'on-site' in question_text or 'hybrid' in question_text or 'onsite' in question_text:
-                    answer = self.get_answer('commute')
-
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    # if choice == "":
-                    #    choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'country code' in question_text:
-                    self.select_dropdown(dropdown_field, self.personal_info['Phone Country Code'])
-
-                elif 'north korea' in question_text:
-                    choice = ""
-                    for option in options:
-                        if 'no' in option.lower():
-                            choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'previously employed' in question_text or 'previous employment' in question_text:
-                    choice = ""
-                    for option in options:
-                        if 'no' in option.lower():
-                            choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'sponsor' in question_text:
-                    answer = self.get_answer('requireVisa')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'above 18' in question_text.lower():  # Check for "above 18" in the question text
-                    choice = ""
-                    for option in options:
-                        if 'yes' in option.lower():  # Select 'yes' option
-                            choice = option
-                    if choice == "":
-                        choice = options[0]  # Default to the first option if 'yes' is not found
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'currently living' in question_text or 'currently reside' in question_text:
-                    answer = self.get_answer('residency')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'authorized' in question_text or 'authorised' in question_text:
-                    answer = self.get_answer('legallyAuthorized')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            # find some common words
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'citizenship' in question_text:
-                    answer = self.get_answer('legallyAuthorized')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'clearance' in question_text:
-                    answer = self.get_answer('clearance')
-                    choice = ""
-                    for option in options:
-                        if answer == 'yes':
-                            choice = option
-                        else:
-                            if 'no' in option.lower():
-                                choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif any(keyword in question_text.lower() for keyword in
-                         [
-                             'aboriginal', 'native', 'indigenous', 'tribe', 'first nations',
-                             'native american', 'native hawaiian', 'inuit', 'metis', 'maori',
-                             'aborigine', 'ancestral', 'native peoples', 'original people',
-                             'first people', 'gender', 'race', 'disability', 'latino'
-                         ]):
-                    negative_keywords = ['prefer', 'decline', 'don\'t', 'specified', 'none']
-
-                    choice = ""
-                    choice = next((option for options in option.lower() if
-                               any(neg_keyword in option.lower() for neg_keyword in negative_keywords)), None)
-
-                    self.select_dropdown(dropdown_field, choice)
-
-                elif 'email' in question_text:
-                    continue  # assume email address is filled in properly by default
-
-                elif 'experience' in question_text or 'understanding' in question_text or 'familiar' in question_text or 'comfortable' in question_text or 'able to' in question_text:
-                    answer = 'no'
-                    if self.experience_default > 0:
-                        answer = 'yes'
-                    else:
-                        for experience in self.experience:
-                            if experience.lower() in question_text and self.experience[experience] > 0:
-                                answer = 'yes'
-                                break
-                    if answer == 'no':
-                        # record unlisted experience as unprepared questions
-                        self.record_unprepared_question("dropdown", question_text)
-
-                    choice = ""
-                    for option in options:
-                        if answer in option.lower():
-                            choice = option
-                    if choice == "":
-                        choice = options[len(options) - 1]
-                    self.select_dropdown(dropdown_field, choice)
+        elif any(keyword in radio_text.lower() for keyword in
+                 ['certified', 'certificate', 'cpa', 'chartered accountant', 'qualification']):
+            answer = self.get_answer('certifiedProfessional')
 
-                else:
-                    print(f"Unhandled dropdown question: {question_text}")
-                    self.record_unprepared_question("dropdown", question_text)
-
-                    # Since no response can be determined, we use AI to identify the best responseif available, falling back "yes" or the final response if the AI response is not available
-                    choice = options[len(options) - 1]
-                    choices = [(i, option) for i, option in enumerate(options)]
-                    ai_response = self.ai_response_generator.generate_response(
-                        question_text,
-                        response_type="choice",
-                        options=choices
-                    )
-                    if ai_response is not None:
-                        choice = options[ai_response]
-                    else:
-                        choice = ""
-                        for option in options:
-                            if 'yes' in option.lower():
-                                choice = option
+        elif 'urgent' in radio_text:
+            answer = self.get_answer('urgentFill')
 
-                    print(f"Selected option: {choice}")
-                    self.select_dropdown(dropdown_field, choice)
-                continue
-            except:
-                print("An exception occurred while filling up dropdown field")  # TODO: Put logging behind debug flag
+        elif 'commut' in radio_text or 'on-site' in radio_text or 'hybrid' in radio_text or 'onsite' in radio_text:
+            answer = self.get_answer('commute')
 
-            # Checkbox check for agreeing to terms and service
-            try:
-                clickable_checkbox = question.find_element(By.TAG_NAME, 'label')
-                clickable_checkbox.click()
-            except:
-                print("An exception occurred while filling up checkbox field")  # TODO: Put logging behind debug flag
+        elif 'remote' in radio_text:
+            answer = self.get_answer('remote')
+
+        elif 'background check' in radio_text:
+            answer = self.get_answer('backgroundCheck')
+
+        elif 'drug test' in radio_text:
+            answer = self.get_answer('drugTest')
+
+        elif 'currently living' in radio_text or 'currently reside' in radio_text or 'right to live' in radio_text:
+            answer = 'yes' if self.residency else 'no'
+
+        elif 'level of education' in radio_text:
+            for degree in self.checkboxes['degreeCompleted']:
+                if degree.lower() in radio_text:
+                    answer = "yes"
+                    break
+
+        elif 'experience' in radio_text:
+            if self.experience_default > 0:
+                answer = 'yes'
+            else:
+                for experience in self.experience:
+                    if experience.lower() in radio_text:
+                        answer = "yes"
+                        break
+
+        elif 'data retention' in radio_text:
+            answer = 'no'
+
+        elif 'sponsor' in radio_text:
+            answer = self.get_answer('requireVisa')
+
+        if answer is not None:
+            print(f"Choosing answer: {answer}")
+            for i, option_text in radio_options:
+                if answer in option_text:
+                    return i
+            print("Answer not found in radio options")
+
+        print("No answer determined")
+        self.record_unprepared_question("radio", radio_text)
+
+        # Since no response can be determined, we use AI to identify the best response if available, falling back to the final option if the AI response is not available
+        return PendingAIAnswer(radio_text, "choice", radio_options,
+                               lambda ai_response: ai_response if ai_response is not None else len(radio_options) - 1)
+
+    def decide_text_answer(self, question):
+        question_text = question['label'].lower()
+        if self.debug:
+            print(question_text)
+
+        # For decimal and integer response fields, the id contains 'numeric' while the type remains 'text'
+        text_field_type = question['kind']
+
+        to_enter = ''
+        if 'experience' in question_text or 'how many years in' in question_text:
+            no_of_years = None
+            for experience in self.experience:
+                if experience.lower() in question_text:
+                    no_of_years = int(self.experience[experience])
+                    break
+            if no_of_years is None:
+                self.record_unprepared_question(text_field_type, question_text)
+                no_of_years = int(self.experience_default)
+            to_enter = no_of_years
+
+        elif 'grade point average' in question_text:
+            to_enter = self.university_gpa
+
+        elif 'first name' in question_text:
+            to_enter = self.personal_info['First Name']
+
+        elif 'last name' in question_text:
+            to_enter = self.personal_info['Last Name']
+
+        elif 'name' in question_text:
+            to_enter = self.personal_info['First Name'] + " " + self.personal_info['Last Name']
+
+        elif 'pronouns' in question_text:
+            to_enter = self.personal_info['Pronouns']
+
+        elif 'phone' in question_text:
+            to_enter = self.personal_info['Mobile Phone Number']
+
+        elif 'linkedin' in question_text:
+            to_enter = self.personal_info['Linkedin']
+
+        elif 'message to hiring' in question_text or 'cover letter' in question_text:
+            to_enter = self.personal_info['MessageToManager']
+
+        elif 'website' in question_text or 'github' in question_text or 'portfolio' in question_text:
+            to_enter = self.personal_info['Website']
+
+        elif 'notice' in question_text or 'weeks' in question_text:
+            if text_field_type == 'numeric':
+                to_enter = int(self.notice_period)
+            else:
+                to_enter = str(self.notice_period)
+
+        elif 'salary' in question_text or 'expectation' in question_text or 'compensation' in question_text or 'CTC' in question_text:
+            if text_field_type == 'numeric':
+                to_enter = int(self.salary_minimum)
+            else:
+                to_enter = float(self.salary_minimum)
+            self.record_unprepared_question(text_field_type, question_text)
+
+        # Since no response can be determined, we use AI to generate a response if available, falling back to 0 or empty string if the AI response is not available
+        if text_field_type == 'numeric':
+            if not isinstance(to_enter, (int, float)):
+                return PendingAIAnswer(question_text, "numeric", None,
+                                       lambda ai_response: ai_response if ai_response is not None else 0)
+        elif to_enter == '':
+            return PendingAIAnswer(question_text, "text", None,
+                                   lambda ai_response: ai_response if ai_response is not None else " ‏‏‎ ")
+
+        return to_enter
+
+    def choose_option(self, options, answer, default_last=True):
+        """Pick the dropdown option matching a yes/no answer, as the dropdown questions below expect."""
+        choice = ""
+        for option in options:
+            if answer == 'yes':
+                choice = option
+            else:
+                if 'no' in option.lower():
+                    choice = option
+        if choice == "" and default_last:
+            choice = options[len(options) - 1]
+        return choice
+
+    def decide_dropdown_answer(self, question):
+        question_text = question['label'].lower()
+        options = question['options']
+        if self.debug:
+            print(f"Dropdown question text: {question_text}")
+            print(f"Dropdown options: {options}")
+
+        if 'proficiency' in question_text:
+            proficiency = "None"
+            for language in self.languages:
+                if language.lower() in question_text:
+                    proficiency = self.languages[language]
+                    break
+            return proficiency
+
+        elif 'clearance' in question_text:
+            choice = self.choose_option(options, self.get_answer('securityClearance'), default_last=False)
+            if choice == "":
+                self.record_unprepared_question("dropdown", question_text)
+            return choice
+
+        elif 'assessment' in question_text:
+            return self.choose_option(options, self.get_answer('assessment'), default_last=False)
+
+        elif 'commut' in question_text or 'on-site' in question_text or 'hybrid' in question_text or 'onsite' in question_text:
+            return self.choose_option(options, self.get_answer('commute'), default_last=False)
+
+        elif 'country code' in question_text:
+            return self.personal_info['Phone Country Code']
+
+        elif 'north korea' in question_text:
+            return self.choose_option(options, 'no')
+
+        elif 'previously employed' in question_text or 'previous employment' in question_text:
+            return self.choose_option(options, 'no')
+
+        elif 'sponsor' in question_text:
+            return self.choose_option(options, self.get_answer('requireVisa'))
+
+        elif 'above 18' in question_text.lower():  # Check for "above 18" in the question text
+            choice = ""
+            for option in options:
+                if 'yes' in option.lower():  # Select 'yes' option
+                    choice = option
+            if choice == "":
+                choice = options[0]  # Default to the first option if 'yes' is not found
+            return choice
+
+        elif 'currently living' in question_text or 'currently reside' in question_text:
+            return self.choose_option(options, 'yes' if self.residency else 'no')
+
+        elif 'authorized' in question_text or 'authorised' in question_text:
+            return self.choose_option(options, self.get_answer('legallyAuthorized'))
+
+        elif 'citizenship' in question_text:
+            answer = self.get_answer('legallyAuthorized')
+            choice = ""
+            for option in options:
+                if answer == 'yes':
+                    if 'no' in option.lower():
+                        choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+            return choice
+
+        elif any(keyword in question_text.lower() for keyword in
+                 [
+                     'aboriginal', 'native', 'indigenous', 'tribe', 'first nations',
+                     'native american', 'native hawaiian', 'inuit', 'metis', 'maori',
+                     'aborigine', 'ancestral', 'native peoples', 'original people',
+                     'first people', 'gender', 'race', 'disability', 'latino'
+                 ]):
+            negative_keywords = ['prefer', 'decline', 'don\'t', 'specified', 'none']
+            return next((option for option in options if
+                         any(neg_keyword in option.lower() for neg_keyword in negative_keywords)), "")
+
+        elif 'email' in question_text:
+            return None  # assume email address is filled in properly by default
+
+        elif 'experience' in question_text or 'understanding' in question_text or 'familiar' in question_text or 'comfortable' in question_text or 'able to' in question_text:
+            answer = 'no'
+            if self.experience_default > 0:
+                answer = 'yes'
+            else:
+                for experience in self.experience:
+                    if experience.lower() in question_text and self.experience[experience] > 0:
+                        answer = 'yes'
+                        break
+            if answer == 'no':
+                # record unlisted experience as unprepared questions
+                self.record_unprepared_question("dropdown", question_text)
+
+            choice = ""
+            for option in options:
+                if answer in option.lower():
+                    choice = option
+            if choice == "":
+                choice = options[len(options) - 1]
+            return choice
+
+        print(f"Unhandled dropdown question: {question_text}")
+        self.record_unprepared_question("dropdown", question_text)
+
+        # Since no response can be determined, we use AI to identify the best response if available, falling back "yes" or the final response if the AI response is not available
+        def choose(ai_response):
+            if ai_response is not None:
+                choice = options[ai_response]
+            else:
+                choice = ""
+                for option in options:
+                    if 'yes' in option.lower():
+                        choice = option
+            print(f"Selected option: {choice}")
+            return choice
+
+        choices = [(i, option) for i, option in enumerate(options)]
+        return PendingAIAnswer(question_text, "choice", choices, choose)
 
     def unfollow(self):
-        try:
-            follow_checkbox = self.browser.find_element(By.XPATH,
-                                                        "//label[contains(.,\'to stay up to date with their page.\')]").click()
+        follow_checkbox = self.lookups.optional(By.XPATH, "//label[contains(.,\'to stay up to date with their page.\')]")
+        if follow_checkbox is not None:
             follow_checkbox.click()
-        except:
-            pass
 
     def send_resume(self):
         print("Trying to send resume")
         try:
-            file_upload_elements = (By.CSS_SELECTOR, "input[name='file']")
-            if len(self.browser.find_elements(file_upload_elements[0], file_upload_elements[1])) > 0:
-                input_buttons = self.browser.find_elements(file_upload_elements[0], file_upload_elements[1])
-                if len(input_buttons) == 0:
-                    raise Exception("No input elements found in element")
+            input_buttons = self.lookups.all(By.CSS_SELECTOR, "input[name='file']")
+            if len(input_buttons) > 0:
                 for upload_button in input_buttons:
                     upload_type = upload_button.find_element(By.XPATH, "..").find_element(By.XPATH,
                                                                                           "preceding-sibling::*")
@@ -1155,7 +3521,7 @@ class LinkedinEasyApply:
     # Contact info fill-up
     def contact_info(self, form):
         print("Trying to fill up contact info fields")
-        frm_el = form.find_elements(By.TAG_NAME, 'label')
+        frm_el = self.lookups.all(By.TAG_NAME, 'label', root=form)
         if len(frm_el) > 0:
             for el in frm_el:
                 text = el.text.lower()
@@ -1163,16 +3529,20 @@ class LinkedinEasyApply:
                     continue
                 elif 'phone number' in text:
                     try:
-                        country_code_picker = el.find_element(By.XPATH,
-                                                              '//select[contains(@id,"phoneNumber")][contains(@id,"country")]')
-                        self.select_dropdown(country_code_picker, self.personal_info['Phone Country Code'])
+                        country_code_picker = self.lookups.optional(By.XPATH,
+                                                                    '//select[contains(@id,"phoneNumber")][contains(@id,"country")]')
+                        # Forms for a single country have no country code picker
+                        if country_code_picker is not None:
+                            self.select_dropdown(country_code_picker, self.personal_info['Phone Country Code'])
                     except Exception as e:
                         print("Country code " + self.personal_info[
                             'Phone Country Code'] + " not found. Please make sure it is same as in LinkedIn.")
                         print(e)
                     try:
-                        phone_number_field = el.find_element(By.XPATH,
-                                                             '//input[contains(@id,"phoneNumber")][contains(@id,"nationalNumber")]')
+                        phone_number_field = self.lookups.optional(By.XPATH,
+                                                                   '//input[contains(@id,"phoneNumber")][contains(@id,"nationalNumber")]')
+                        if phone_number_field is None:
+                            raise NoSuchElementException("No phone number field")
                         self.enter_text(phone_number_field, self.personal_info['Mobile Phone Number'])
                     except Exception as e:
                         print("Could not enter phone number:")
@@ -1183,13 +3553,15 @@ class LinkedinEasyApply:
             easy_apply_modal_content = self.browser.find_element(By.CLASS_NAME, "jobs-easy-apply-modal__content")
             form = easy_apply_modal_content.find_element(By.TAG_NAME, 'form')
             try:
-                label = form.find_element(By.TAG_NAME, 'h3').text.lower()
+                heading = self.lookups.optional(By.TAG_NAME, 'h3', root=form)
+                label = heading.text.lower() if heading is not None else ''
                 if 'home address' in label:
                     self.home_address(form)
                 elif 'contact info' in label:
                     self.contact_info(form)
                 elif 'resume' in label:
-                    self.send_resume()
+                    with self.metrics.stage('upload'):
+                        self.send_resume()
                 else:
                     self.additional_questions(form)
             except Exception as e:
@@ -1198,37 +3570,86 @@ class LinkedinEasyApply:
         except:
             print("An exception occurred while searching for form in modal")
 
-    def write_to_file(self, company, job_title, link, location, search_location):
-        to_write = [company, job_title, link, location, search_location, datetime.now()]
-        file_path = self.file_name + ".csv"
-        print(f'updated {file_path}.')
-
-        with open(file_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(to_write)
+    def browser_summary(self):
+        summary = "Search page loads: "
+        if self.page_load_times:
+            load_times = sorted(self.page_load_times)
+            summary += f"{len(load_times)} pages, median {load_times[len(load_times) // 2]:.0f} ms, max {load_times[-1]:.0f} ms"
+        else:
+            summary += "not measured"
+        rss = chrome_rss_mb(self.browser)
+        summary += f"; Chrome memory: {f'{rss:.0f} MB' if rss is not None else 'not measured (install psutil)'}"
+        return summary
+
+    def run_stats(self):
+        """Counters for this run, summed across workers by the supervisor in main.py."""
+        stats = dict(self.run_counts)
+        if self.page_load_times:
+            stats['page_load_ms'] = round(sum(self.page_load_times))
+        rss = chrome_rss_mb(self.browser)
+        if rss is not None:
+            stats['chrome_rss_mb'] = round(rss)
+        for name, count in self.ai_response_generator.token_usage.items():
+            stats[f'llm_{name}'] = count
+        stats['webdriver_calls'] = self.metrics.counters['webdriver_calls']
+        stats['implicit_wait_misses'] = self.metrics.counters['implicit_wait_misses']
+        stats['implicit_wait_miss_seconds'] = round(self.metrics.counters['implicit_wait_miss_seconds'], 1)
+        stats['implicit_wait_seconds_avoided'] = self.metrics.counters['zero_wait_misses'] * IMPLICIT_WAIT_SECONDS
+        for name in ('paced_applications', 'paced_pages', 'pacing_waits', 'pacing_limit_reached', 'jobs_discovered'):
+            stats[name] = self.metrics.counters[name]
+        stats['pacing_wait_seconds'] = round(self.metrics.counters['pacing_wait_seconds'] + self.metrics.counters['pacing_jitter_seconds'], 1)
+        if self.ai_response_generator._client:
+            for name, count in self.ai_response_generator._client.stats.items():
+                stats[f'llm_{name}'] = count
+        for kind, seconds in self.waiter.totals().items():
+            stats[f'{kind}_seconds'] = round(seconds, 1)
+        for name, cache in (('answer_cache', self.ai_response_generator.answer_cache), ('job_fit_cache', self.ai_response_generator.job_fit_cache)):
+            if cache:
+                stats[f'{name}_hits'] = cache.hits
+                stats[f'{name}_misses'] = cache.misses
+        return stats
+
+    def close(self):
+        """Save the selector ranking, flush the buffered results and close every connection to the ledger file."""
+        self.selectors.close()
+        self.unprepared_questions.close()
+        self.search_scheduler.close()
+        self.ledger.close()
+        # Closed last, as it removes its journal once everything in it has been written
+        self.result_writer.close()
+
+    def record_job(self, job_id, state, company=None, job_title=None, link=None, location=None, search_location=None):
+        self.run_counts[state] += 1
+        try:
+            self.ledger.record(job_id, state, title=job_title, company=company, link=link, location=location,
+                               search_location=search_location)
+        except Exception:
+            print(f"Unable to record job {job_id} as {state} in {self.ledger.path}.")
+            traceback.print_exc()
 
     def record_unprepared_question(self, answer_type, question_text):
-        to_write = [answer_type, question_text]
-        file_path = self.unprepared_questions_file_name + ".csv"
-
         try:
-            with open(file_path, 'a') as f:
-                writer = csv.writer(f)
-                writer.writerow(to_write)
-                print(f'Updated {file_path} with {to_write}.')
-        except:
-            print(
-                "Special characters in questions are not allowed. Failed to update unprepared questions log.")
-            print(question_text)
-
-    def scroll_slow(self, scrollable_element, start=0, end=3600, step=100, reverse=False):
-        if reverse:
-            start, end = end, start
-            step = -step
+            self.last_unprepared_question = self.unprepared_questions.record(answer_type, question_text)
+        except Exception:
+            print(f"Failed to record the unprepared question: {question_text}")
+            traceback.print_exc()
 
-        for i in range(start, end, step):
-            self.browser.execute_script("arguments[0].scrollTo(0, {})".format(i), scrollable_element)
-            time.sleep(random.uniform(0.1, .6))
+    def human_scroll(self, scrollable_element, seconds):
+        """
+        Scroll down and back up over an element in a few jittered steps, taking about the given number of seconds.
+        This is pacing only: loading the results list does not depend on it.
+        """
+        if seconds <= 0:
+            return
+        with self.metrics.stage('human scroll'):
+            height = self.browser.execute_script("return arguments[0].scrollHeight", scrollable_element) or 0
+            steps = max(2, min(8, int(seconds / 0.4)))
+            down = [int(height * i / steps) for i in range(1, steps + 1)]
+            positions = down + down[-2::-1] + [0]
+            for position in positions:
+                self.browser.execute_script("arguments[0].scrollTo({top: arguments[1], behavior: 'smooth'})",
+                                            scrollable_element, position)
+                self.waiter.sleep("human scroll", seconds / len(positions) * random.uniform(0.5, 1.5))
 
     def avoid_lock(self):
         if self.disable_lock:
@@ -1291,7 +3712,13 @@ class LinkedinEasyApply:
         return extra_search_terms_str
 
     def next_job_page(self, position, location, job_page):
-        self.browser.get("https://www.linkedin.com/jobs/search/" + self.base_search_url +
+        self.browser.get(self.linkedin_url + "/jobs/search/" + self.base_search_url +
                          "&keywords=" + position + location + "&start=" + str(job_page * 25))
+        try:
+            timing = self.browser.execute_script(PAGE_LOAD_TIMING_SCRIPT)
+            if timing:
+                self.page_load_times.append(timing['load'])
+        except Exception:
+            pass
 
         self.avoid_lock()
@@ -1,25 +1,53 @@
-import yaml, os
+import yaml, os, argparse, multiprocessing
+from collections import Counter
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import NoSuchElementException
 from validate_email import validate_email
 from webdriver_manager.chrome import ChromeDriverManager
-from linkedineasyapply import LinkedinEasyApply
+from linkedineasyapply import LinkedinEasyApply, IMPLICIT_WAIT_SECONDS, PAGE_STATE_SCRIPT, evaluate_prefilter, export_history, unprepared_question_report
 
-def init_browser():
+# Requests blocked in lean mode: images, fonts, media and tracking endpoints the bot never needs
+LEAN_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3', '*.m3u8',
+    '*media.licdn.com*', '*dms.licdn.com*',
+    '*px.ads.linkedin.com*', '*linkedin.com/li/track*', '*linkedin.com/realtime*',
+    '*doubleclick.net*', '*google-analytics.com*', '*googletagmanager.com*', '*bat.bing.com*'
+]
+
+def init_browser(user_data_dir="chrome_bot", debugging_port=9222, lean=False):
     browser_options = Options()
     options = [
         '--disable-blink-features',
         '--no-sandbox',
-        '--start-maximized',
         '--disable-extensions',
         '--ignore-certificate-errors',
         '--disable-blink-features=AutomationControlled',
-        '--remote-debugging-port=9222'
+        f'--remote-debugging-port={debugging_port}'
     ]
+    if lean:
+        # Headless with a fixed viewport, no images and no background services
+        options += [
+            '--headless=new',
+            '--window-size=1366,900',
+            '--blink-settings=imagesEnabled=false',
+            '--mute-audio',
+            '--no-first-run',
+            '--disable-dev-shm-usage',
+            '--disable-background-networking',
+            '--disable-component-update',
+            '--disable-default-apps',
+            '--disable-sync',
+            '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication'
+        ]
+    else:
+        options.append('--start-maximized')
 
     # Restore session if possible (avoids login everytime)
-    user_data_dir = os.path.join(os.getcwd(), "chrome_bot")
+    user_data_dir = os.path.join(os.getcwd(), user_data_dir)
     browser_options.add_argument(f"user-data-dir={user_data_dir}")
 
     for option in options:
@@ -27,13 +55,57 @@ def init_browser():
 
     service = Service(ChromeDriverManager().install())
     driver = webdriver.Chrome(service=service, options=browser_options)
-    driver.implicitly_wait(1)  # Wait time in seconds to allow loading of elements
-    driver.set_window_position(0, 0)
-    driver.maximize_window()
+    driver.implicitly_wait(IMPLICIT_WAIT_SECONDS)  # Wait time in seconds to allow loading of elements
+    if lean:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+    else:
+        driver.set_window_position(0, 0)
+        driver.maximize_window()
     return driver
 
-def validate_yaml():
-    with open("config.yaml", 'r', encoding='utf-8') as stream:
+class StubElement:
+    def __init__(self, text=""):
+        self.text = text
+
+    def get_attribute(self, name):
+        return ""
+
+
+class StubDriver:
+    """
+    Stand-in for the Chrome driver that answers every search with LinkedIn's empty results banner.
+
+    Used with --stub-driver to exercise the supervisor and workers without a browser or a LinkedIn session.
+    """
+    current_url = "https://www.linkedin.com/feed/"
+
+    def get(self, url):
+        self.current_url = url
+
+    def find_element(self, by, value):
+        if value == 'jobs-search-two-pane__no-results-banner--expand':
+            return StubElement("No matching jobs found")
+        raise NoSuchElementException(f"Stub driver has no element {value}")
+
+    def find_elements(self, by, value):
+        return []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        if script == PAGE_STATE_SCRIPT:
+            return {'url': self.current_url, 'modal_open': False, 'modal_errors': [],
+                    'empty_results': ["No matching jobs found"], 'results_header': None, 'checkpoint': False, 'headings': [], 'notices': []}
+        return None
+
+    def quit(self):
+        pass
+
+
+def validate_yaml(config_path="config.yaml"):
+    with open(config_path, 'r', encoding='utf-8') as stream:
         try:
             parameters = yaml.safe_load(stream)
         except yaml.YAMLError as exc:
@@ -144,11 +216,118 @@ def validate_yaml():
 
     return parameters
 
+def run_worker(worker_index, config_path, shard, stub_driver, results):
+    parameters = validate_yaml(config_path)
+    parameters['searchShard'] = shard
+    # Every worker needs its own Chrome profile and debugging port
+    parameters['chromeProfile'] = f"{parameters.get('chromeProfile') or 'chrome_bot'}_{worker_index}"
+    if parameters.get('traceFile'):
+        trace_root, trace_ext = os.path.splitext(parameters['traceFile'])
+        parameters['traceFile'] = f"{trace_root}_{worker_index}{trace_ext}"
+
+    if stub_driver:
+        parameters['dryRun'] = True
+        parameters['disableAntiLock'] = True
+        parameters['readinessTimeout'] = 0.1
+        browser = StubDriver()
+    else:
+        browser = init_browser(parameters['chromeProfile'], 9222 + worker_index, parameters.get('leanBrowser', False))
+
+    bot = None
+    try:
+        bot = LinkedinEasyApply(parameters, browser)
+        if not stub_driver:
+            bot.login()
+            bot.security_check()
+        bot.start_applying()
+    finally:
+        # If the constructor raised there are no stats, and its exception is left to propagate
+        if bot is not None:
+            results.put((worker_index, config_path, bot.run_stats()))
+            bot.close()
+        browser.quit()
+
+def supervise(config_paths, workers, stub_driver=False):
+    """
+    Start one worker process per slot, assigning the configs round-robin. Workers that share a config
+    split its search plan between them, and all workers print a combined summary when they finish.
+    """
+    assignments = [config_paths[i % len(config_paths)] for i in range(workers)]
+    results = multiprocessing.Queue()
+    processes = []
+    for worker_index, config_path in enumerate(assignments):
+        same_config = [i for i, path in enumerate(assignments) if path == config_path]
+        shard = (same_config.index(worker_index), len(same_config))
+        print(f"Starting worker {worker_index} with {config_path}, search shard {shard[0] + 1} of {shard[1]}")
+        process = multiprocessing.Process(target=run_worker, args=(worker_index, config_path, shard, stub_driver, results),
+                                          name=f"worker-{worker_index}")
+        process.start()
+        processes.append(process)
+
+    worker_stats = {}
+    while len(worker_stats) < len(processes) and any(process.is_alive() for process in processes):
+        try:
+            worker_index, config_path, stats = results.get(timeout=5)
+            worker_stats[worker_index] = (config_path, stats)
+        except Exception:
+            pass
+    for process in processes:
+        process.join()
+
+    total = Counter()
+    print("Worker results:")
+    for worker_index in sorted(worker_stats):
+        config_path, stats = worker_stats[worker_index]
+        total.update(stats)
+        print(f"  worker {worker_index} ({config_path}): {stats}")
+    failed = [process.name for process in processes if process.exitcode != 0]
+    if failed:
+        print(f"  workers that exited with an error: {', '.join(failed)}")
+    print(f"  total: {dict(total)}")
+    return total
+
 if __name__ == '__main__':
-    parameters = validate_yaml()
-    browser = init_browser()
+    parser = argparse.ArgumentParser(description="LinkedIn Easy Apply bot")
+    parser.add_argument('--config', action='append',
+                        help="Config file to use (default config.yaml). Repeat to run several candidate profiles with --workers.")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Run this many worker processes, each with its own Chrome profile, debugging port and share of the searches.")
+    parser.add_argument('--stub-driver', action='store_true',
+                        help="Run workers against a stub browser that returns no jobs, to test the worker setup offline.")
+    parser.add_argument('--evaluate-prefilter', action='store_true',
+                        help="Compare the local job fit prefilter with the AI verdicts stored in aiCacheFile, then exit.")
+    parser.add_argument('--export', metavar='DESTINATION',
+                        help="Copy the history in ledgerFile to DESTINATION for analysis, then exit.")
+    parser.add_argument('--export-format', choices=['sqlite', 'parquet'], default='sqlite',
+                        help="Export a single SQLite file, or a directory with one Parquet file per table (needs pyarrow).")
+    parser.add_argument('--unprepared-report', nargs='?', type=int, const=30, metavar='N',
+                        help="List the N (default 30) questions config.yaml most often had no answer for, then exit.")
+    args = parser.parse_args()
+    config_paths = args.config or ["config.yaml"]
 
-    bot = LinkedinEasyApply(parameters, browser)
-    bot.login()
-    bot.security_check()
-    bot.start_applying()
\ No newline at end of file
+    if args.unprepared_report:
+        parameters = validate_yaml(config_paths[0])
+        unprepared_question_report(parameters.get('ledgerFile') or 'applications.db', args.unprepared_report)
+    elif args.export:
+        parameters = validate_yaml(config_paths[0])
+        export_history(parameters.get('ledgerFile') or 'applications.db', args.export, args.export_format)
+    elif args.evaluate_prefilter:
+        parameters = validate_yaml(config_paths[0])
+        bot = LinkedinEasyApply(parameters, StubDriver())
+        try:
+            evaluate_prefilter(bot.ai_response_generator)
+        finally:
+            bot.close()
+    elif args.workers > 0 or args.stub_driver:
+        supervise(config_paths, max(args.workers, 1), args.stub_driver)
+    else:
+        parameters = validate_yaml(config_paths[0])
+        browser = init_browser(parameters.get('chromeProfile') or 'chrome_bot', lean=parameters.get('leanBrowser', False))
+
+        bot = LinkedinEasyApply(parameters, browser)
+        try:
+            bot.login()
+            bot.security_check()
+            bot.start_applying()
+        finally:
+            bot.close()
\ No newline at end of file